@@ -12,13 +12,14 @@ setup(
     author_email="yijia.xiao@cs.ucla.edu",
     url="https://github.com/TauricResearch",
     packages=find_packages(),
+    package_data={"tradingagents.dataflows": ["ticker_aliases.json"]},
     install_requires=[
         "langchain>=0.1.0",
         "langchain-openai>=0.0.2",
         "langchain-experimental>=0.0.40",
         "langgraph>=0.0.20",
         "numpy>=1.24.0",
-        "pandas>=2.0.0",
+        "pandas>=2.2.0",
         "praw>=7.7.0",
         "stockstats>=0.5.4",
         "yfinance>=0.2.31",
@@ -0,0 +1,111 @@
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+
+from tradingagents.dataflows import googlenews_utils
+from tradingagents.dataflows.config import get_config, set_config
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "google_news_page.html")
+
+
+@pytest.fixture
+def page():
+    with open(FIXTURE, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch, page):
+    """Serve the recorded page for the first results page of every query; record each request URL."""
+    saved = get_config()
+    set_config(
+        {
+            "data_cache_dir": str(tmp_path),
+            "google_news_min_interval": 0.0,
+            "google_news_jitter": 0.0,
+            "google_news_daily_span": 3,
+        }
+    )
+    urls = []
+
+    async def fetch_page(url, politeness):
+        urls.append(url)
+        return page if url.endswith("&start=0") else b"<html><body></body></html>"
+
+    monkeypatch.setattr(googlenews_utils, "_fetch_page", fetch_page)
+    yield urls
+    set_config(saved)
+
+
+def test_parse_results(page):
+    results, has_next = googlenews_utils.parse_results(page)
+    assert has_next
+    assert [r["link"] for r in results] == [
+        "https://www.example.com/markets/apple-earnings-beat",
+        "https://news.example.org/tech/iphone-shipments",
+    ]
+    assert results[0] == {
+        "link": "https://www.example.com/markets/apple-earnings-beat",
+        "title": "Apple earnings beat estimates on services growth",
+        "snippet": "Apple reported quarterly revenue above expectations as services hit a record.",
+        "date": "Mar 5, 2024",
+        "source": "Example Markets",
+    }
+
+
+def test_parse_results_last_page():
+    results, has_next = googlenews_utils.parse_results(b"<html><body></body></html>")
+    assert results == [] and not has_next
+
+
+def test_result_day():
+    now = datetime(2024, 3, 6, 15, 0)
+    assert googlenews_utils.result_day("Mar 5, 2024", now) == datetime(2024, 3, 5)
+    assert googlenews_utils.result_day("2 days ago", now) == datetime(2024, 3, 4)
+    assert googlenews_utils.result_day("1 month ago", now) is None
+
+
+def test_days_are_cached(scraper):
+    first = googlenews_utils.getNewsData("AAPL", "2024-03-04", "2024-03-05")
+    # Two days, each scraped on its own: the recorded page, then an empty next page
+    assert len(scraper) == 4
+    assert all("cd_min:03/0" in url for url in scraper)
+    assert len(first) == 2
+
+    scraper.clear()
+    again = googlenews_utils.getNewsData("AAPL", "2024-03-04", "2024-03-05")
+    assert scraper == []
+    assert again == first
+
+
+def test_sliding_window_scrapes_only_new_days(scraper):
+    googlenews_utils.getNewsData("AAPL", "2024-03-04", "2024-03-05")
+    scraper.clear()
+    googlenews_utils.getNewsData("AAPL", "2024-03-04", "2024-03-06")
+    assert len(scraper) == 2
+    assert all("cd_min:03/06/2024,cd_max:03/06/2024" in url for url in scraper)
+
+
+def test_cold_window_uses_one_range_query(scraper):
+    results = googlenews_utils.getNewsData("AAPL", "2024-03-01", "2024-03-10")
+    assert len(scraper) == 2
+    assert "cd_min:03/01/2024,cd_max:03/10/2024" in scraper[0]
+    assert len(results) == 2
+
+    # The range results were split into days by their date labels and cached
+    day = googlenews_utils._read_day("AAPL", datetime(2024, 3, 5))
+    assert [r["title"] for r in day] == ["Apple earnings beat estimates on services growth"]
+    assert googlenews_utils._read_day("AAPL", datetime(2024, 3, 8)) == []
+
+    scraper.clear()
+    assert googlenews_utils.getNewsData("AAPL", "2024-03-02", "2024-03-09") == results
+    assert scraper == []
+
+
+def test_runs_inside_an_event_loop(scraper):
+    async def agent_step():
+        return googlenews_utils.getNewsData("AAPL", "2024-03-04", "2024-03-05")
+
+    assert len(asyncio.run(agent_step())) == 2
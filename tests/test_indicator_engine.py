@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from stockstats import wrap
+
+from tradingagents.dataflows.indicator_engine import (
+    INDICATOR_DESCRIPTIONS,
+    compute_indicators,
+    compute_indicators_with_state,
+    extend_indicators,
+)
+
+
+@pytest.fixture(scope="module")
+def ohlcv():
+    """Deterministic daily bars: a seeded random walk long enough for the 200 SMA."""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2022-01-03", periods=420)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(dates))))
+    open_ = close * (1 + rng.normal(0, 0.004, len(dates)))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, len(dates)))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, len(dates)))
+    volume = rng.integers(1_000_000, 5_000_000, len(dates)).astype(float)
+    return pd.DataFrame(
+        {
+            "Date": dates.strftime("%Y-%m-%d"),
+            "Open": open_,
+            "High": high,
+            "Low": low,
+            "Close": close,
+            "Volume": volume,
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def engine(ohlcv):
+    return compute_indicators(ohlcv)
+
+
+@pytest.fixture(scope="module")
+def reference(ohlcv):
+    return wrap(ohlcv.copy())
+
+
+@pytest.mark.parametrize("indicator", list(INDICATOR_DESCRIPTIONS))
+def test_matches_stockstats(engine, reference, indicator):
+    expected = reference[indicator].to_numpy(dtype=float)
+    actual = engine[indicator].to_numpy(dtype=float)
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_extend_matches_full_history(ohlcv, engine):
+    split = 300
+    _, state = compute_indicators_with_state(ohlcv.iloc[:split])
+    tail, _ = extend_indicators(ohlcv, split, state)
+    pd.testing.assert_frame_equal(tail, engine.iloc[split:], rtol=1e-9)
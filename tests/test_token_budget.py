@@ -0,0 +1,110 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.agents.utils import token_budget
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.utils import estimate_tokens
+
+
+@pytest.fixture
+def daily():
+    """Business days of 2024 with prices that identify their day and unit volume."""
+    dates = pd.bdate_range("2024-01-01", "2024-12-31")
+    base = np.arange(len(dates), dtype=float) + 100
+    return pd.DataFrame(
+        {
+            "Open": base,
+            "High": base + 1,
+            "Low": base - 1,
+            "Close": base + 0.5,
+            "Volume": np.full(len(dates), 1000.0),
+        },
+        index=pd.DatetimeIndex(dates, name="Date"),
+    )
+
+
+def as_csv(frame: pd.DataFrame, header: str = "") -> str:
+    return header + frame.to_csv(date_format="%Y-%m-%d")
+
+
+@pytest.fixture
+def budgets():
+    saved = get_config()
+    yield
+    set_config(saved)
+
+
+def test_weekly_resample(daily):
+    weekly = token_budget._resample(daily, "W-FRI")
+    # 2024-01-01 is a Monday: the first bar covers Jan 1-5 and is labeled with its last day
+    first = weekly.iloc[0]
+    assert weekly.index[0] == pd.Timestamp("2024-01-05")
+    assert (first["Open"], first["High"], first["Low"], first["Close"]) == (100.0, 105.0, 99.0, 104.5)
+    assert first["Volume"] == 5000.0
+    assert weekly["Volume"].sum() == daily["Volume"].sum()
+
+
+def test_monthly_bars_come_from_daily_rows(daily):
+    text = as_csv(daily)
+    parsed = token_budget._split_table(text)
+    monthly_rows = len(token_budget._resample(daily, "ME"))
+    budget = estimate_tokens(token_budget._render("", daily.iloc[:monthly_rows], True, "x" * 80)) + 20
+    out, steps = token_budget._compact_table(text, budget, parsed)
+
+    assert steps == ["rounded", "weekly resample", "monthly resample"]
+    assert out.startswith("# Compacted to fit")
+    monthly = pd.read_csv(io.StringIO(out.split("\n", 1)[1]), index_col="Date", parse_dates=True)
+    # Each month holds exactly its own days, even where a week spans the month end
+    expected = daily["Volume"].resample("ME").sum()
+    np.testing.assert_array_equal(monthly["Volume"].to_numpy(), expected.to_numpy())
+    assert monthly.loc["2024-01-31", "Open"] == 100.0
+    assert monthly.loc["2024-01-31", "Close"] == daily.loc["2024-01-31", "Close"]
+
+
+def test_descending_tables_stay_descending(daily):
+    text = as_csv(daily.iloc[::-1])
+    out, _ = token_budget._compact_table(text, 400, token_budget._split_table(text))
+    dates = [line.split(",")[0] for line in out.splitlines()[2:]]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_summary_change_only_for_prices(daily):
+    text = as_csv(daily, "# AAPL daily bars\n")
+    out, steps = token_budget._compact_table(text, 10, token_budget._split_table(text))
+    assert steps[-1] == "summary statistics"
+    assert out.startswith("# AAPL daily bars\n# Compacted to fit a 10-token budget: summary statistics of")
+
+    stats = token_budget._summary(daily)
+    assert stats.loc["Close", "change_%"] == pytest.approx((daily["Close"].iloc[-1] / 100.5 - 1) * 100, abs=0.01)
+    assert np.isnan(stats.loc["Volume", "change_%"])
+
+
+def test_truncate_keeps_every_section():
+    finnhub = "## AAPL News:\n" + "".join(f"### headline {i}\nsummary of the story {i}\n" for i in range(300))
+    reddit = "##AAPL News Reddit:\n\n" + "".join(f"### post {i}\n\nshort body {i}\n\n" for i in range(10))
+    google = "## AAPL Google News:\n\n" + "".join(f"### story {i}\n\nsnippet {i} with words\n\n" for i in range(200))
+    budget = estimate_tokens(finnhub + reddit + google) // 4
+
+    out, steps = token_budget._truncate(finnhub + reddit + google, budget)
+    assert steps == ["truncated"]
+    assert estimate_tokens(out) <= budget
+    # The small section fits in its fair share and is kept whole; the large ones are cut
+    assert reddit in out
+    assert "### headline 0\n" in out and "### story 0\n" in out
+    assert "### headline 299\n" not in out and "### story 199\n" not in out
+    assert out.count("more lines omitted") == 2
+
+
+def test_budget_is_opt_in(daily, budgets):
+    text = as_csv(daily)
+    set_config({"tool_token_budget": None, "tool_token_budgets": {}})
+    assert token_budget.apply_token_budget("get_stock_data", text) is text
+
+    set_config({"tool_token_budgets": {"get_stock_data": 500}})
+    assert token_budget.apply_token_budget("get_news", text) is text
+    compacted = token_budget.apply_token_budget("get_stock_data", text)
+    assert estimate_tokens(compacted) <= 500
+    assert "weekly resample" in compacted or "monthly resample" in compacted
@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.agents.utils.token_budget import apply_token_budget
 
 
 @tool
@@ -17,7 +18,7 @@ def get_fundamentals(
     Returns:
         str: A formatted report containing comprehensive fundamental data
     """
-    return route_to_vendor("get_fundamentals", ticker, curr_date)
+    return apply_token_budget("get_fundamentals", route_to_vendor("get_fundamentals", ticker, curr_date))
 
 
 @tool
@@ -36,7 +37,7 @@ def get_balance_sheet(
     Returns:
         str: A formatted report containing balance sheet data
     """
-    return route_to_vendor("get_balance_sheet", ticker, freq, curr_date)
+    return apply_token_budget("get_balance_sheet", route_to_vendor("get_balance_sheet", ticker, freq, curr_date))
 
 
 @tool
@@ -55,7 +56,7 @@ def get_cashflow(
     Returns:
         str: A formatted report containing cash flow statement data
     """
-    return route_to_vendor("get_cashflow", ticker, freq, curr_date)
+    return apply_token_budget("get_cashflow", route_to_vendor("get_cashflow", ticker, freq, curr_date))
 
 
 @tool
@@ -74,4 +75,4 @@ def get_income_statement(
     Returns:
         str: A formatted report containing income statement data
     """
-    return route_to_vendor("get_income_statement", ticker, freq, curr_date)
\ No newline at end of file
+    return apply_token_budget("get_income_statement", route_to_vendor("get_income_statement", ticker, freq, curr_date))
\ No newline at end of file
@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.agents.utils.token_budget import apply_token_budget
 
 @tool
 def get_news(
@@ -18,7 +19,7 @@ def get_news(
     Returns:
         str: A formatted string containing news data
     """
-    return route_to_vendor("get_news", ticker, start_date, end_date)
+    return apply_token_budget("get_news", route_to_vendor("get_news", ticker, start_date, end_date))
 
 @tool
 def get_global_news(
@@ -36,7 +37,7 @@ def get_global_news(
     Returns:
         str: A formatted string containing global news data
     """
-    return route_to_vendor("get_global_news", curr_date, look_back_days, limit)
+    return apply_token_budget("get_global_news", route_to_vendor("get_global_news", curr_date, look_back_days, limit))
 
 @tool
 def get_insider_sentiment(
@@ -52,7 +53,7 @@ def get_insider_sentiment(
     Returns:
         str: A report of insider sentiment data
     """
-    return route_to_vendor("get_insider_sentiment", ticker, curr_date)
+    return apply_token_budget("get_insider_sentiment", route_to_vendor("get_insider_sentiment", ticker, curr_date))
 
 @tool
 def get_insider_transactions(
@@ -68,4 +69,4 @@ def get_insider_transactions(
     Returns:
         str: A report of insider transaction data
     """
-    return route_to_vendor("get_insider_transactions", ticker, curr_date)
+    return apply_token_budget("get_insider_transactions", route_to_vendor("get_insider_transactions", ticker, curr_date))
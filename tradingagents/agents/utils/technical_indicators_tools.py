@@ -1,6 +1,7 @@
 from langchain_core.tools import tool
 from typing import Annotated
 from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.agents.utils.token_budget import apply_token_budget
 
 @tool
 def get_indicators(
@@ -20,4 +21,4 @@ def get_indicators(
     Returns:
         str: A formatted dataframe containing the requested technical indicators.
     """
-    return route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days)
\ No newline at end of file
+    return apply_token_budget("get_indicators", route_to_vendor("get_indicators", symbol, indicator, curr_date, look_back_days))
\ No newline at end of file
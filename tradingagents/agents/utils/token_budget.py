@@ -0,0 +1,238 @@
+import re
+import threading
+from io import StringIO
+from typing import Annotated, Optional
+
+import numpy as np
+import pandas as pd
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.telemetry import emit
+from tradingagents.dataflows.utils import estimate_tokens
+
+# How each price column combines when rows are resampled; other columns keep the last value
+_RESAMPLE_AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+# Columns kept by the projection step, in priority order
+_PROJECTED_COLUMNS = ("close", "adj close", "volume")
+
+# Columns whose first-to-last change is reported by the summary step
+_PRICE_COLUMNS = ("open", "high", "low", "close", "adj close", "adjusted_close")
+
+_RESAMPLE_RULES = (("weekly", "W-FRI"), ("monthly", "ME"))
+
+# Start of a top-level "##" section of text output (split before the heading line)
+_SECTION = re.compile(r"^(?=##(?!#))", re.MULTILINE)
+
+_usage = {}
+_usage_lock = threading.Lock()
+
+
+def get_token_budget(tool_name: str) -> Optional[int]:
+    """
+    Token budget for a tool: config["tool_token_budgets"][tool_name], else
+    config["tool_token_budget"]. None (the default) leaves the output untouched.
+    """
+    config = get_config()
+    budgets = config.get("tool_token_budgets") or {}
+    return budgets.get(tool_name, config.get("tool_token_budget"))
+
+
+def _split_table(text: str):
+    """
+    Split tool output into (comment header, date-indexed frame, ascending), or None
+    when the body is not a CSV table with a date first column.
+    """
+    lines = text.splitlines(keepends=True)
+    header_len = 0
+    while header_len < len(lines) and (lines[header_len].startswith("#") or not lines[header_len].strip()):
+        header_len += 1
+    body = "".join(lines[header_len:])
+    if not body.strip():
+        return None
+    try:
+        frame = pd.read_csv(StringIO(body))
+    except Exception:
+        return None
+    if len(frame) < 2 or frame.shape[1] < 2:
+        return None
+
+    dates = pd.to_datetime(frame.iloc[:, 0], errors="coerce")
+    if dates.isna().mean() > 0.2 or frame.iloc[:, 1:].select_dtypes("number").empty:
+        return None
+    frame = frame.set_index(dates.rename(frame.columns[0])).iloc[:, 1:]
+    frame = frame[frame.index.notna()]
+    ascending = bool(frame.index.is_monotonic_increasing)
+    return "".join(lines[:header_len]), frame.sort_index(kind="stable"), ascending
+
+
+def _round(frame: pd.DataFrame) -> pd.DataFrame:
+    numeric = frame.select_dtypes("number")
+    # Two decimals for prices and ratios, whole numbers for large values such as volume
+    large = numeric.abs().median() >= 1e4
+    rounded = numeric.round(2)
+    rounded.loc[:, large] = numeric.loc[:, large].round(0)
+    return frame.assign(**{c: rounded[c] for c in numeric.columns})
+
+
+def _resample(frame: pd.DataFrame, rule: str) -> pd.DataFrame:
+    agg = {c: _RESAMPLE_AGG.get(str(c).lower(), "last") for c in frame.columns}
+    days = frame.index.to_series().resample(rule)
+    # Drop periods without rows, and label each bar with the last day it covers
+    has_rows = (days.count() > 0).to_numpy()
+    resampled = frame.resample(rule).agg(agg)[has_rows]
+    return resampled.set_axis(pd.DatetimeIndex(days.last()[has_rows].to_numpy(), name=frame.index.name))
+
+
+def _project(frame: pd.DataFrame) -> pd.DataFrame:
+    keep = [c for c in frame.columns if str(c).lower() in _PROJECTED_COLUMNS]
+    return frame[keep] if keep else frame.iloc[:, :1]
+
+
+def _summary(frame: pd.DataFrame) -> pd.DataFrame:
+    numeric = frame.select_dtypes("number")
+    stats = pd.DataFrame(
+        {
+            "first": numeric.iloc[0],
+            "last": numeric.iloc[-1],
+            "min": numeric.min(),
+            "max": numeric.max(),
+            "mean": numeric.mean(),
+        }
+    )
+    # A change is only meaningful for prices, not for volume or oscillators
+    prices = numeric[[c for c in numeric.columns if str(c).lower() in _PRICE_COLUMNS]]
+    stats["change_%"] = (prices.iloc[-1] / prices.iloc[0] - 1) * 100
+    return stats.replace([np.inf, -np.inf], np.nan).round(2)
+
+
+def _render(header: str, frame: pd.DataFrame, ascending: bool, note: str) -> str:
+    rows = frame if ascending else frame.iloc[::-1]
+    date_format = "%Y-%m-%d" if (frame.index == frame.index.normalize()).all() else None
+    return f"{header}# {note}\n" + rows.to_csv(date_format=date_format)
+
+
+def _compact_table(text: str, budget: int, parsed) -> tuple:
+    """Apply the compaction steps in order until the table fits; returns (text, steps)."""
+    header, frame, ascending = parsed
+    original_rows = len(frame)
+    start, end = frame.index[0].strftime("%Y-%m-%d"), frame.index[-1].strftime("%Y-%m-%d")
+    steps = ["rounded"]
+    frame = _round(frame)
+    period = "daily"
+
+    def candidate():
+        note = (
+            f"Compacted to fit a {budget}-token budget: {len(frame)} {period} rows "
+            f"from {original_rows} ({', '.join(steps)})"
+        )
+        return _render(header, frame, ascending, note)
+
+    out = candidate()
+    daily = frame
+    for period_name, rule in _RESAMPLE_RULES:
+        if estimate_tokens(out) <= budget:
+            return out, steps
+        # Always resample the daily rows: a weekly bar spanning a month end would
+        # otherwise be counted wholly in one month
+        resampled = _resample(daily, rule)
+        if len(resampled) < len(frame):
+            frame, period = resampled, period_name
+            steps.append(f"{period_name} resample")
+            out = candidate()
+
+    if estimate_tokens(out) <= budget:
+        return out, steps
+    projected = _project(frame)
+    if projected.shape[1] < frame.shape[1]:
+        frame = projected
+        steps.append("columns " + ", ".join(map(str, frame.columns)))
+        out = candidate()
+    if estimate_tokens(out) <= budget:
+        return out, steps
+
+    steps.append("summary statistics")
+    return (
+        f"{header}# Compacted to fit a {budget}-token budget: summary statistics of "
+        f"{original_rows} rows from {start} to {end}\n" + _summary(parsed[1]).to_string() + "\n",
+        steps,
+    )
+
+
+def _cut(text: str, budget: float) -> str:
+    """Keep whole leading lines of text within the budget."""
+    lines = text.splitlines(keepends=True)
+    # Characters per token for this text, to find the cut without re-encoding every prefix
+    ratio = max(len(text), 1) / max(estimate_tokens(text), 1)
+    limit = int(budget * ratio * 0.95)
+    kept, size = [], 0
+    for line in lines:
+        if size + len(line) > limit:
+            break
+        kept.append(line)
+        size += len(line)
+    if len(kept) == len(lines):
+        return text
+    return "".join(kept) + f"[... {len(lines) - len(kept)} more lines omitted]\n\n"
+
+
+def _truncate(text: str, budget: int) -> tuple:
+    """
+    Cut each "##" section of the text at a line boundary. Sections share the
+    budget fairly: ones smaller than their share are kept whole and the rest is
+    split between the larger ones, so every source in a combined output (e.g.
+    finnhub, reddit and google news) keeps its leading items.
+    """
+    sections = [s for s in _SECTION.split(text) if s]
+    sizes = [estimate_tokens(section) for section in sections]
+    shares, remaining = {}, budget
+    for left, i in enumerate(sorted(range(len(sections)), key=sizes.__getitem__)):
+        shares[i] = min(sizes[i], remaining / (len(sections) - left))
+        remaining -= shares[i]
+    kept = "".join(
+        section if sizes[i] <= shares[i] else _cut(section, shares[i]) for i, section in enumerate(sections)
+    )
+    return kept + f"\n[Output cut to fit a {budget}-token budget]\n", ["truncated"]
+
+
+def apply_token_budget(
+    tool_name: Annotated[str, "tool name, used to look up its budget"],
+    output: Annotated[str, "tool output"],
+) -> str:
+    """
+    Fit a tool's output to its token budget (see get_token_budget) and record the
+    original and emitted token counts.
+
+    Tables with a date column are compacted deterministically: rounding, then
+    weekly and monthly resampling, then projection to close/volume, and finally
+    summary statistics. Other output is cut at line boundaries, section by
+    section.
+    """
+    if not isinstance(output, str):
+        return output
+    budget = get_token_budget(tool_name)
+    raw_tokens = estimate_tokens(output)
+    steps = []
+    text = output
+    if budget and raw_tokens > budget:
+        parsed = _split_table(output)
+        text, steps = _compact_table(output, budget, parsed) if parsed else _truncate(output, budget)
+
+    tokens = raw_tokens if text is output else estimate_tokens(text)
+    with _usage_lock:
+        usage = _usage.setdefault(tool_name, {"calls": 0, "compacted": 0, "raw_tokens": 0, "tokens": 0})
+        usage["calls"] += 1
+        usage["compacted"] += bool(steps)
+        usage["raw_tokens"] += raw_tokens
+        usage["tokens"] += tokens
+    emit(
+        "tool.output", "debug", tool=tool_name, raw_tokens=raw_tokens, tokens=tokens,
+        budget=budget, steps=steps,
+    )
+    return text
+
+
+def token_usage() -> dict:
+    """Per-tool call counts and original vs emitted token totals for this process."""
+    with _usage_lock:
+        return {tool: dict(usage) for tool, usage in _usage.items()}
@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+from collections import deque
+from typing import Annotated, Dict, Iterable, List, Optional, Set
+
+from .config import get_config
+from .hot_cache import file_version
+
+DEFAULT_ALIAS_FILE = os.path.join(os.path.dirname(__file__), "ticker_aliases.json")
+
+
+def _fold(text: str) -> str:
+    """
+    Lower-case text one character at a time, keeping its length so offsets in the
+    folded text index the original ("İ".lower() is two code points).
+    """
+    return "".join(ch.lower()[:1] for ch in text)
+
+
+class AliasMatcher:
+    """
+    Aho-Corasick automaton over ticker symbols and company aliases.
+
+    One pass over a document finds every ticker it mentions. Matches must sit on
+    word boundaries (no letter or digit on either side). Company aliases match
+    case-insensitively; bare ticker symbols must appear in upper case, optionally
+    prefixed with "$", so that e.g. "V" or "X" do not match ordinary words.
+    """
+
+    def __init__(self, aliases: Dict[str, Iterable[str]]):
+        self.tickers = frozenset(aliases)
+        # Trie over lower-cased patterns; outputs hold (pattern length, ticker, exact text or None)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[list] = [[]]
+
+        for ticker, names in aliases.items():
+            self._add(ticker, ticker, case_sensitive=True)
+            for name in names:
+                name = name.strip()
+                if name:
+                    self._add(name, ticker, case_sensitive=False)
+        self._build()
+
+    def _add(self, pattern: str, ticker: str, case_sensitive: bool) -> None:
+        state = 0
+        for ch in _fold(pattern):
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((len(pattern), ticker, pattern if case_sensitive else None))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state == 0:
+                    # Depth-one states always fail back to the root
+                    self._fail[nxt] = 0
+                else:
+                    fail = self._fail[state]
+                    while fail and ch not in self._goto[fail]:
+                        fail = self._fail[fail]
+                    self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def match(self, text: Annotated[str, "document to scan"]) -> Set[str]:
+        """Return the set of tickers mentioned in text."""
+        found = set()
+        if not text:
+            return found
+        lowered = _fold(text)
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(lowered):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, ticker, exact in self._out[state]:
+                if ticker in found:
+                    continue
+                start = i - length + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if i + 1 < n and text[i + 1].isalnum():
+                    continue
+                if exact is not None and text[start:i + 1] != exact:
+                    continue
+                found.add(ticker)
+        return found
+
+    def mentions(self, text: str, ticker: str) -> bool:
+        return ticker in self.match(text)
+
+
+def load_aliases(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Load the ticker -> aliases mapping (config["ticker_alias_file"] or the bundled file)."""
+    path = path or get_config().get("ticker_alias_file") or DEFAULT_ALIAS_FILE
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+_matcher_cache = {}
+
+
+def get_alias_matcher() -> AliasMatcher:
+    """Get the matcher for the configured alias file, rebuilt when the file changes."""
+    path = get_config().get("ticker_alias_file") or DEFAULT_ALIAS_FILE
+    key = (path, file_version(path))
+    matcher = _matcher_cache.get(key)
+    if matcher is None:
+        matcher = AliasMatcher(load_aliases(path))
+        _matcher_cache.clear()
+        _matcher_cache[key] = matcher
+    return matcher
+
+
+def alias_version() -> str:
+    """Content hash of the configured alias file, for invalidating tags built from it."""
+    path = get_config().get("ticker_alias_file") or DEFAULT_ALIAS_FILE
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
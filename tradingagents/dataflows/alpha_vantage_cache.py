@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import threading
+from typing import Annotated, Callable
+
+from .config import get_config
+from .utils import connect_sqlite
+from .telemetry import emit
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+
+# Per-function (ttl, stale) in seconds: entries younger than ttl are served as-is,
+# entries younger than ttl + stale are served while a background refresh runs.
+# Functions not listed here are never cached.
+CACHE_TTLS = {
+    "OVERVIEW": (7 * _DAY, 90 * _DAY),
+    "BALANCE_SHEET": (7 * _DAY, 90 * _DAY),
+    "CASH_FLOW": (7 * _DAY, 90 * _DAY),
+    "INCOME_STATEMENT": (7 * _DAY, 90 * _DAY),
+    "INSIDER_TRANSACTIONS": (_DAY, 7 * _DAY),
+    "TIME_SERIES_DAILY_ADJUSTED": (6 * _HOUR, _DAY),
+    "SMA": (6 * _HOUR, _DAY),
+    "EMA": (6 * _HOUR, _DAY),
+    "MACD": (6 * _HOUR, _DAY),
+    "RSI": (6 * _HOUR, _DAY),
+    "BBANDS": (6 * _HOUR, _DAY),
+    "ATR": (6 * _HOUR, _DAY),
+    "NEWS_SENTIMENT": (_HOUR, 6 * _HOUR),
+}
+
+# Request parameters that do not change the response
+_IGNORED_PARAMS = ("apikey", "source")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    function TEXT NOT NULL,
+    body TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+)
+"""
+
+_local = threading.local()
+_lock = threading.Lock()
+_refreshing = set()
+_stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+
+
+def _cache_path() -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "alpha_vantage_cache.sqlite")
+
+
+def _connection():
+    path = _cache_path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != path:
+        conn = connect_sqlite(path)
+        conn.execute(_SCHEMA)
+        _local.conn, _local.path = conn, path
+    return conn
+
+
+def _ttl(function_name: str):
+    overrides = get_config().get("alpha_vantage_cache_ttls") or {}
+    return overrides.get(function_name, CACHE_TTLS.get(function_name))
+
+
+def cache_key(function_name: str, params: dict) -> str:
+    """Canonical key for a request: the function plus its normalized parameters."""
+    normalized = {}
+    for name, value in params.items():
+        if name in _IGNORED_PARAMS or name == "function" or value is None:
+            continue
+        value = str(value)
+        if name in ("symbol", "tickers"):
+            value = value.upper()
+        normalized[name] = value
+    return json.dumps([function_name, sorted(normalized.items())])
+
+
+def _is_cacheable(body: str) -> bool:
+    """Only keep real payloads; error and notice responses come back as small JSON objects."""
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        return True
+    return not (
+        isinstance(payload, dict)
+        and any(k in payload for k in ("Error Message", "Information", "Note"))
+    )
+
+
+def _store(key: str, function_name: str, body: str) -> None:
+    if _is_cacheable(body):
+        _connection().execute(
+            "INSERT OR REPLACE INTO responses (key, function, body, fetched_at) VALUES (?, ?, ?, ?)",
+            (key, function_name, body, time.time()),
+        )
+
+
+def _refresh(key: str, function_name: str, fetch: Callable[[], str]) -> None:
+    try:
+        _store(key, function_name, fetch())
+    except Exception as e:
+        emit("alpha_vantage_cache.refresh_failed", "warning", function=function_name, error=str(e))
+    finally:
+        with _lock:
+            _refreshing.discard(key)
+
+
+def cached_request(
+    function_name: Annotated[str, "Alpha Vantage function, e.g. OVERVIEW"],
+    params: Annotated[dict, "full request parameters"],
+    fetch: Annotated[Callable[[], str], "performs the request and returns the body"],
+    refresh: Annotated[bool, "skip the cached entry and store a fresh response"] = False,
+) -> str:
+    """
+    Serve an Alpha Vantage request from the persistent response cache.
+
+    Fresh entries are returned without touching the network or the quota. Stale
+    entries within their stale window are returned immediately while one
+    background thread refetches them; anything older, or missing, is fetched
+    inline. With refresh, the request is always fetched inline.
+    """
+    ttl = _ttl(function_name)
+    if ttl is None or not get_config().get("alpha_vantage_cache", True):
+        return fetch()
+
+    key = cache_key(function_name, params)
+    row = None
+    if not refresh:
+        row = _connection().execute(
+            "SELECT body, fetched_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+    if row is not None:
+        body, fetched_at = row
+        age = time.time() - fetched_at
+        if age < ttl[0]:
+            with _lock:
+                _stats["hits"] += 1
+            return body
+        if age < ttl[0] + ttl[1]:
+            with _lock:
+                _stats["stale_hits"] += 1
+                start = key not in _refreshing
+                _refreshing.add(key)
+            if start:
+                threading.Thread(
+                    target=_refresh, args=(key, function_name, fetch), daemon=True
+                ).start()
+            return body
+
+    with _lock:
+        _stats["misses"] += 1
+    body = fetch()
+    _store(key, function_name, body)
+    return body
+
+
+def cache_stats() -> dict:
+    """Hit, stale-hit and miss counts of this process, with the overall hit rate."""
+    with _lock:
+        stats = dict(_stats)
+    total = stats["hits"] + stats["stale_hits"] + stats["misses"]
+    stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / total if total else 0.0
+    return stats
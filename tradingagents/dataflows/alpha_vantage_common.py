@@ -5,6 +5,10 @@ import json
 from datetime import datetime
 from io import StringIO
 
+from .config import get_config
+from .alpha_vantage_quota import acquire, estimate_wait, report_rate_limited
+from .alpha_vantage_cache import cached_request
+
 API_BASE_URL = "https://www.alphavantage.co/query"
 
 def get_api_key() -> str:
@@ -39,11 +43,16 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
-def _make_api_request(function_name: str, params: dict) -> dict | str:
+def _make_api_request(function_name: str, params: dict, refresh: bool = False) -> dict | str:
     """Helper function to make API requests and handle responses.
     
+    Responses are served from the persistent cache when possible (see
+    alpha_vantage_cache), unless refresh is set; calls that reach the API are
+    scheduled against the shared quota (see alpha_vantage_quota).
+
     Raises:
-        AlphaVantageRateLimitError: When API rate limit is exceeded
+        AlphaVantageRateLimitError: When API rate limit is exceeded, or the quota wait
+            exceeds config["alpha_vantage_max_wait"]
     """
     # Create a copy of params to avoid modifying the original
     api_params = params.copy()
@@ -62,8 +71,20 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
     elif "entitlement" in api_params:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
-    
-    response = requests.get(API_BASE_URL, params=api_params)
+
+    return cached_request(function_name, api_params, lambda: _send_request(api_params), refresh=refresh)
+
+
+def _send_request(api_params: dict) -> str:
+    """Send one request to the API, after reserving quota for it."""
+    # Queue for the shared per-minute/per-day budget; give up early if the wait is too long
+    max_wait = get_config().get("alpha_vantage_max_wait")
+    if acquire(max_wait) is None:
+        raise AlphaVantageRateLimitError(
+            f"Alpha Vantage quota exhausted: next call in {estimate_wait():.0f}s exceeds max wait of {max_wait}s"
+        )
+
+    response = requests.get(API_BASE_URL, params=api_params, timeout=get_config().get("http_timeout", 30))
     response.raise_for_status()
 
     response_text = response.text
@@ -75,6 +96,7 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         if "Information" in response_json:
             info_message = response_json["Information"]
             if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+                report_rate_limited(info_message)
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
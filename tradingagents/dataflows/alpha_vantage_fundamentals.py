@@ -1,4 +1,13 @@
+import json
+
+import pandas as pd
+
 from .alpha_vantage_common import _make_api_request
+from .fundamentals_warehouse import get_statement_as_of, META_COLUMNS
+from .fundamentals_view import compact_enabled, compact_statement
+
+# Non-numeric fields of Alpha Vantage statement reports
+TEXT_FIELDS = ["reportedCurrency"]
 
 
 def get_fundamentals(ticker: str, curr_date: str = None) -> str:
@@ -19,23 +28,87 @@ def get_fundamentals(ticker: str, curr_date: str = None) -> str:
     return _make_api_request("OVERVIEW", params)
 
 
+def _statement_as_of(function_name: str, statement: str, ticker: str, freq: str, curr_date: str) -> str:
+    """
+    Serve an Alpha Vantage statement from the fundamentals warehouse: only the
+    requested frequency, and only reports published on or before curr_date.
+    Responses without reports (errors, notes) are returned unchanged.
+    """
+    period = "quarterly" if freq.lower() == "quarterly" else "annual"
+    reports_key = f"{period}Reports"
+    unparsed = {}
+
+    def fetch():
+        response = _make_api_request(function_name, {"symbol": ticker})
+        try:
+            payload = json.loads(response)
+        except (TypeError, ValueError):
+            payload = None
+        if not isinstance(payload, dict) or reports_key not in payload:
+            unparsed["response"] = response
+            return None
+        frame = pd.DataFrame(payload[reports_key])
+        for column in frame.columns:
+            if column not in TEXT_FIELDS + ["fiscalDateEnding"]:
+                frame[column] = pd.to_numeric(frame[column], errors="coerce")
+        return frame.rename(columns={"fiscalDateEnding": "Report Date"})
+
+    rows = get_statement_as_of("alpha_vantage", ticker, statement, period, curr_date, fetch)
+    if rows is None:
+        if unparsed:
+            return unparsed["response"]
+        return json.dumps({"symbol": ticker.upper(), reports_key: []}, indent=4)
+
+    def field(value):
+        if isinstance(value, str):
+            return value
+        if pd.isna(value):
+            return "None"
+        return str(int(value)) if float(value).is_integer() else str(value)
+
+    reports = []
+    for _, row in rows.iterrows():
+        report = {"fiscalDateEnding": row["Report Date"].strftime("%Y-%m-%d")}
+        report.update({k: field(v) for k, v in row.drop(META_COLUMNS).items()})
+        reports.append(report)
+
+    latest = rows.iloc[0]
+    as_of = curr_date or pd.Timestamp.now().strftime("%Y-%m-%d")
+    full_text = json.dumps(
+        {
+            "symbol": ticker.upper(),
+            "asOf": as_of,
+            "latestPublished": f"{latest['Publish Date']:%Y-%m-%d} ({latest['Publish Basis']})",
+            reports_key: reports,
+        },
+        indent=4,
+    )
+    if not compact_enabled():
+        return full_text
+
+    header = (
+        f"# {statement.replace('_', ' ').title()} for {ticker.upper()} ({period}), "
+        f"reports published on or before {as_of}\n"
+        f"# Latest period: {latest['Report Date']:%Y-%m-%d}, "
+        f"published {latest['Publish Date']:%Y-%m-%d} ({latest['Publish Basis']}); "
+        f"currency {latest.get('reportedCurrency', 'n/a')}\n"
+    )
+    return header + compact_statement(rows, "alpha_vantage", statement, period, raw_text=full_text)
+
+
 def get_balance_sheet(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
     """
     Retrieve balance sheet data for a given ticker symbol using Alpha Vantage.
 
     Args:
         ticker (str): Ticker symbol of the company
-        freq (str): Reporting frequency: annual/quarterly (default quarterly) - not used for Alpha Vantage
-        curr_date (str): Current date you are trading at, yyyy-mm-dd (not used for Alpha Vantage)
+        freq (str): Reporting frequency: annual/quarterly (default quarterly)
+        curr_date (str): Current date you are trading at, yyyy-mm-dd; only reports published by then are returned
 
     Returns:
         str: Balance sheet data with normalized fields
     """
-    params = {
-        "symbol": ticker,
-    }
-
-    return _make_api_request("BALANCE_SHEET", params)
+    return _statement_as_of("BALANCE_SHEET", "balance_sheet", ticker, freq, curr_date)
 
 
 def get_cashflow(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
@@ -44,17 +117,13 @@ def get_cashflow(ticker: str, freq: str = "quarterly", curr_date: str = None) ->
 
     Args:
         ticker (str): Ticker symbol of the company
-        freq (str): Reporting frequency: annual/quarterly (default quarterly) - not used for Alpha Vantage
-        curr_date (str): Current date you are trading at, yyyy-mm-dd (not used for Alpha Vantage)
+        freq (str): Reporting frequency: annual/quarterly (default quarterly)
+        curr_date (str): Current date you are trading at, yyyy-mm-dd; only reports published by then are returned
 
     Returns:
         str: Cash flow statement data with normalized fields
     """
-    params = {
-        "symbol": ticker,
-    }
-
-    return _make_api_request("CASH_FLOW", params)
+    return _statement_as_of("CASH_FLOW", "cashflow", ticker, freq, curr_date)
 
 
 def get_income_statement(ticker: str, freq: str = "quarterly", curr_date: str = None) -> str:
@@ -63,15 +132,11 @@ def get_income_statement(ticker: str, freq: str = "quarterly", curr_date: str =
 
     Args:
         ticker (str): Ticker symbol of the company
-        freq (str): Reporting frequency: annual/quarterly (default quarterly) - not used for Alpha Vantage
-        curr_date (str): Current date you are trading at, yyyy-mm-dd (not used for Alpha Vantage)
+        freq (str): Reporting frequency: annual/quarterly (default quarterly)
+        curr_date (str): Current date you are trading at, yyyy-mm-dd; only reports published by then are returned
 
     Returns:
         str: Income statement data with normalized fields
     """
-    params = {
-        "symbol": ticker,
-    }
-
-    return _make_api_request("INCOME_STATEMENT", params)
+    return _statement_as_of("INCOME_STATEMENT", "income_statement", ticker, freq, curr_date)
 
@@ -1,4 +1,59 @@
-from .alpha_vantage_common import _make_api_request
+import pandas as pd
+
+from .config import get_config
+from .alpha_vantage_common import _make_api_request, AlphaVantageRateLimitError
+from .alpha_vantage_stock import get_daily_adjusted_history, get_daily_adjusted_version
+from .hot_cache import get_hot_cache
+from .indicator_engine import INDICATOR_DESCRIPTIONS, compute_indicators, indicator_table, RSI_WINDOW, ATR_WINDOW
+
+
+def _adjusted_ohlcv(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Split/dividend-adjust the OHLC columns of a daily adjusted series, as yfinance's
+    auto_adjust does, and split-adjust the volume so VWMA and MFI stay continuous.
+    """
+    factor = frame["adjusted_close"] / frame["close"]
+    if "split_coefficient" in frame:
+        # Shares per original share from the splits after each bar
+        splits = frame["split_coefficient"].fillna(1.0).replace(0.0, 1.0)
+        later_splits = splits[::-1].cumprod()[::-1].shift(-1, fill_value=1.0)
+    else:
+        later_splits = 1.0
+    return pd.DataFrame({
+        "Date": frame["Date"],
+        "open": frame["open"] * factor,
+        "high": frame["high"] * factor,
+        "low": frame["low"] * factor,
+        "close": frame["adjusted_close"],
+        "volume": frame["volume"] * later_splits,
+    })
+
+
+def _get_local_indicator_frame(symbol: str):
+    """
+    Compute every supported indicator from the local daily series (one compact
+    request per day at most). Returns (indicator frame, None) or (None, API reply).
+    """
+    frame, response = get_daily_adjusted_history(symbol)
+    if frame is None:
+        return None, response
+    key = ("alpha_vantage_indicators", symbol.upper(), get_daily_adjusted_version(symbol))
+    return get_hot_cache().get_or_compute(
+        key, lambda: compute_indicators(_adjusted_ohlcv(frame))
+    ), None
+
+
+def _local_mode_applies(indicator: str, interval: str, time_period: int) -> bool:
+    """The local engine covers daily bars with the standard windows only."""
+    if get_config().get("alpha_vantage_indicator_mode", "local") != "local":
+        return False
+    if interval != "daily":
+        return False
+    if indicator == "rsi":
+        return time_period == RSI_WINDOW
+    if indicator == "atr":
+        return time_period == ATR_WINDOW
+    return True
 
 def get_indicator(
     symbol: str,
@@ -14,7 +69,9 @@ def get_indicator(
 
     Args:
         symbol: ticker symbol of the company
-        indicator: technical indicator to get the analysis and report of
+        indicator: technical indicator to get the analysis and report of, or a
+            comma-separated list (returned as one date x indicator table when
+            every indicator is computed locally)
         curr_date: The current trading date you are trading on, YYYY-mm-dd
         look_back_days: how many days to look back
         interval: Time interval (daily, weekly, monthly)
@@ -42,29 +99,39 @@ def get_indicator(
         "vwma": ("VWMA", "close")
     }
 
-    indicator_descriptions = {
-        "close_50_sma": "50 SMA: A medium-term trend indicator. Usage: Identify trend direction and serve as dynamic support/resistance. Tips: It lags price; combine with faster indicators for timely signals.",
-        "close_200_sma": "200 SMA: A long-term trend benchmark. Usage: Confirm overall market trend and identify golden/death cross setups. Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries.",
-        "close_10_ema": "10 EMA: A responsive short-term average. Usage: Capture quick shifts in momentum and potential entry points. Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals.",
-        "macd": "MACD: Computes momentum via differences of EMAs. Usage: Look for crossovers and divergence as signals of trend changes. Tips: Confirm with other indicators in low-volatility or sideways markets.",
-        "macds": "MACD Signal: An EMA smoothing of the MACD line. Usage: Use crossovers with the MACD line to trigger trades. Tips: Should be part of a broader strategy to avoid false positives.",
-        "macdh": "MACD Histogram: Shows the gap between the MACD line and its signal. Usage: Visualize momentum strength and spot divergence early. Tips: Can be volatile; complement with additional filters in fast-moving markets.",
-        "rsi": "RSI: Measures momentum to flag overbought/oversold conditions. Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis.",
-        "boll": "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. Usage: Acts as a dynamic benchmark for price movement. Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals.",
-        "boll_ub": "Bollinger Upper Band: Typically 2 standard deviations above the middle line. Usage: Signals potential overbought conditions and breakout zones. Tips: Confirm signals with other tools; prices may ride the band in strong trends.",
-        "boll_lb": "Bollinger Lower Band: Typically 2 standard deviations below the middle line. Usage: Indicates potential oversold conditions. Tips: Use additional analysis to avoid false reversal signals.",
-        "atr": "ATR: Averages true range to measure volatility. Usage: Set stop-loss levels and adjust position sizes based on current market volatility. Tips: It's a reactive measure, so use it as part of a broader risk management strategy.",
-        "vwma": "VWMA: A moving average weighted by volume. Usage: Confirm trends by integrating price action with volume data. Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-    }
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = curr_date_dt - relativedelta(days=look_back_days)
+
+    if "," in indicator:
+        requested = [i.strip() for i in indicator.split(",") if i.strip()]
+        indicators_list = [i for i in requested if i in supported_indicators]
+        unsupported = [i for i in requested if i not in supported_indicators]
+        if not indicators_list:
+            raise ValueError(
+                f"Indicators {unsupported} are not supported. Please choose from: {list(supported_indicators.keys())}"
+            )
+        note = f"# Unsupported indicators skipped: {', '.join(unsupported)}\n" if unsupported else ""
+        if all(_local_mode_applies(i, interval, time_period) for i in indicators_list):
+            indicators, response = _get_local_indicator_frame(symbol)
+            if indicators is None:
+                return f"Error retrieving {indicator} data: {response}"
+            return note + indicator_table(
+                indicators[indicators_list],
+                pd.Timestamp(before),
+                pd.Timestamp(curr_date_dt),
+                INDICATOR_DESCRIPTIONS,
+                f"{symbol.upper()} indicators from {before.strftime('%Y-%m-%d')} to {curr_date} (trading days, newest first)",
+            )
+        return note + ("\n\n" + "=" * 50 + "\n\n").join(
+            get_indicator(symbol, i, curr_date, look_back_days, interval, time_period, series_type)
+            for i in indicators_list
+        )
 
     if indicator not in supported_indicators:
         raise ValueError(
             f"Indicator {indicator} is not supported. Please choose from: {list(supported_indicators.keys())}"
         )
 
-    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-    before = curr_date_dt - relativedelta(days=look_back_days)
-
     # Get the full data for the period instead of making individual calls
     _, required_series_type = supported_indicators[indicator]
 
@@ -73,6 +140,27 @@ def get_indicator(
         series_type = required_series_type
 
     try:
+        if _local_mode_applies(indicator, interval, time_period):
+            indicators, response = _get_local_indicator_frame(symbol)
+            if indicators is None:
+                return f"Error retrieving {indicator} data: {response}"
+
+            window = indicators.loc[before:curr_date_dt, indicator]
+            ind_string = "".join(
+                f"{date_dt.strftime('%Y-%m-%d')}: {value:.4f}\n" if pd.notna(value)
+                else f"{date_dt.strftime('%Y-%m-%d')}: N/A\n"
+                for date_dt, value in window.items()
+            )
+            if not ind_string:
+                ind_string = "No data available for the specified date range.\n"
+
+            return (
+                f"## {indicator.upper()} values from {before.strftime('%Y-%m-%d')} to {curr_date}:\n\n"
+                + ind_string
+                + "\n\n"
+                + INDICATOR_DESCRIPTIONS.get(indicator, "No description available.")
+            )
+
         # Get indicator data for the period
         if indicator == "close_50_sma":
             data = _make_api_request("SMA", {
@@ -145,7 +233,7 @@ def get_indicator(
         elif indicator == "vwma":
             # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
             # In a real implementation, this would need to be calculated from OHLCV data
-            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
+            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{INDICATOR_DESCRIPTIONS.get('vwma', 'No description available.')}"
         else:
             return f"Error: Indicator {indicator} not implemented yet."
 
@@ -212,11 +300,14 @@ def get_indicator(
             f"## {indicator.upper()} values from {before.strftime('%Y-%m-%d')} to {curr_date}:\n\n"
             + ind_string
             + "\n\n"
-            + indicator_descriptions.get(indicator, "No description available.")
+            + INDICATOR_DESCRIPTIONS.get(indicator, "No description available.")
         )
 
         return result_str
 
+    except AlphaVantageRateLimitError:
+        # Let route_to_vendor fall back to another vendor
+        raise
     except Exception as e:
         print(f"Error getting Alpha Vantage indicator data for {indicator}: {e}")
         return f"Error retrieving {indicator} data: {str(e)}"
@@ -1,4 +1,7 @@
+import json
+
 from .alpha_vantage_common import _make_api_request, format_datetime_for_api
+from .insider_activity import from_alpha_vantage, insider_report
 
 def get_news(ticker, start_date, end_date) -> dict[str, str] | str:
     """Returns live and historical market news & sentiment data from premier news outlets worldwide.
@@ -24,20 +27,28 @@ def get_news(ticker, start_date, end_date) -> dict[str, str] | str:
     
     return _make_api_request("NEWS_SENTIMENT", params)
 
-def get_insider_transactions(symbol: str) -> dict[str, str] | str:
-    """Returns latest and historical insider transactions by key stakeholders.
+def get_insider_transactions(symbol: str, curr_date: str = None) -> str:
+    """Returns insider activity features aggregated from transactions by key stakeholders.
 
     Covers transactions by founders, executives, board members, etc.
 
     Args:
         symbol: Ticker symbol. Example: "IBM".
+        curr_date: Current date you are trading at, yyyy-mm-dd; later transactions are ignored.
 
     Returns:
-        Dictionary containing insider transaction data or JSON string.
+        Rolling net buying/selling, insider counts and cluster-buy flags over trailing
+        windows plus the largest recent trades, or the API response if it has no data.
     """
 
     params = {
         "symbol": symbol,
     }
 
-    return _make_api_request("INSIDER_TRANSACTIONS", params)
\ No newline at end of file
+    response = _make_api_request("INSIDER_TRANSACTIONS", params)
+    try:
+        records = json.loads(response)["data"]
+    except (TypeError, ValueError, KeyError):
+        return response
+
+    return insider_report(symbol, from_alpha_vantage(records), curr_date, "alpha_vantage")
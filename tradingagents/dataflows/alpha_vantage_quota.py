@@ -0,0 +1,159 @@
+import os
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Optional
+
+from .config import get_config
+from .utils import connect_sqlite
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    day TEXT NOT NULL,
+    day_calls INTEGER NOT NULL
+)
+"""
+
+_BUCKET = "alpha_vantage"
+
+_local = threading.local()
+
+
+def _quota_path() -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "alpha_vantage_quota.sqlite")
+
+
+def _connection():
+    path = _quota_path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != path:
+        conn = connect_sqlite(path)
+        conn.execute(_SCHEMA)
+        _local.conn, _local.path = conn, path
+    return conn
+
+
+def _budgets():
+    config = get_config()
+    return (
+        float(config.get("alpha_vantage_calls_per_minute", 5)),
+        int(config.get("alpha_vantage_calls_per_day", 25)),
+    )
+
+
+def _utc_day(now: float) -> str:
+    return datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _seconds_to_next_day(now: float) -> float:
+    current = datetime.fromtimestamp(now, timezone.utc)
+    next_day = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (next_day - current).total_seconds()
+
+
+def _load(conn, now: float):
+    """Current bucket state, refilled up to now: (tokens, day_calls)."""
+    per_minute, _ = _budgets()
+    row = conn.execute(
+        "SELECT tokens, updated, day, day_calls FROM quota WHERE name = ?", (_BUCKET,)
+    ).fetchone()
+    if row is None:
+        return per_minute, 0
+    tokens, updated, day, day_calls = row
+    tokens = min(per_minute, tokens + max(0.0, now - updated) * per_minute / 60.0)
+    if day != _utc_day(now):
+        day_calls = 0
+    return tokens, day_calls
+
+
+def _store(conn, now: float, tokens: float, day_calls: int) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO quota (name, tokens, updated, day, day_calls) VALUES (?, ?, ?, ?, ?)",
+        (_BUCKET, tokens, now, _utc_day(now), day_calls),
+    )
+
+
+def _wait_for(tokens: float, day_calls: int, now: float):
+    """Seconds until the next call may go out: (minute wait, day wait)."""
+    per_minute, per_day = _budgets()
+    minute_wait = 0.0 if tokens >= 1 else (1 - tokens) * 60.0 / per_minute
+    day_wait = _seconds_to_next_day(now) if day_calls >= per_day else 0.0
+    return minute_wait, day_wait
+
+
+def estimate_wait() -> float:
+    """
+    Seconds a new Alpha Vantage call would wait for quota, counting calls already
+    queued by every process sharing the data cache. Lets callers decide between
+    queuing and falling back to another vendor.
+    """
+    conn = _connection()
+    now = time.time()
+    tokens, day_calls = _load(conn, now)
+    return max(_wait_for(tokens, day_calls, now))
+
+
+def acquire(
+    max_wait: Annotated[Optional[float], "longest acceptable wait in seconds; None waits indefinitely"] = None,
+) -> Optional[float]:
+    """
+    Reserve one Alpha Vantage call against the per-minute and per-day budgets.
+
+    The per-minute budget is a token bucket shared across processes through SQLite.
+    A reservation may take a token the bucket has not refilled yet; the caller then
+    sleeps until it has, so concurrent callers queue in reservation order rather
+    than all hitting the API at once. Returns the seconds waited, or None (without
+    reserving) when the wait would exceed max_wait.
+    """
+    conn = _connection()
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            tokens, day_calls = _load(conn, now)
+            minute_wait, day_wait = _wait_for(tokens, day_calls, now)
+            if max_wait is not None and max(minute_wait, day_wait) > max_wait:
+                conn.execute("ROLLBACK")
+                return None
+            if day_wait == 0:
+                _store(conn, now, tokens - 1, day_calls + 1)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        if day_wait > 0:
+            # Daily budget spent: sleep into the next day and reserve again
+            time.sleep(day_wait)
+            if max_wait is not None:
+                max_wait -= day_wait
+            continue
+        if minute_wait > 0:
+            time.sleep(minute_wait)
+        return minute_wait
+
+
+def report_rate_limited(
+    message: Annotated[str, "rate limit message returned by the API"],
+) -> None:
+    """
+    Drain the shared budget after the API refused a call, e.g. when the key is also
+    used outside this scheduler. A daily-limit message exhausts the day's budget.
+    """
+    _, per_day = _budgets()
+    conn = _connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        now = time.time()
+        tokens, day_calls = _load(conn, now)
+        if "per day" in message.lower() or "daily" in message.lower():
+            day_calls = max(day_calls, per_day)
+        _store(conn, now, min(tokens, 0.0), day_calls)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
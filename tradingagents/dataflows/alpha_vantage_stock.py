@@ -1,5 +1,112 @@
+import os
 from datetime import datetime
-from .alpha_vantage_common import _make_api_request, _filter_csv_by_date_range
+from io import StringIO
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .alpha_vantage_common import _make_api_request
+from .price_store import read_store, write_store
+from .hot_cache import file_version
+
+# Relative tolerance when comparing the adjusted close of the overlapping bars of a
+# compact update to the stored series. A dividend or split re-adjusts history.
+OVERLAP_RTOL = 1e-4
+
+
+def _store_path(symbol: str) -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "alpha_vantage_store", f"{symbol.upper()}.npz")
+
+
+def _fetch_daily_adjusted(symbol: str, outputsize: str):
+    """
+    Request TIME_SERIES_DAILY_ADJUSTED as CSV.
+    Returns (frame sorted by date, raw response); frame is None if the response is not CSV data.
+    """
+    params = {
+        "symbol": symbol,
+        "outputsize": outputsize,
+        "datatype": "csv",
+    }
+    # The local store is the cache for this series: a cached response can be up to
+    # a day old, and checked_on would then hide the latest bars until tomorrow
+    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params, refresh=True)
+    if not response.lstrip().startswith("timestamp"):
+        return None, response
+
+    frame = pd.read_csv(StringIO(response))
+    frame = frame.rename(columns={"timestamp": "Date"})
+    frame["Date"] = pd.to_datetime(frame["Date"])
+    frame = frame.sort_values("Date").drop_duplicates("Date", keep="last")
+    return frame.reset_index(drop=True), response
+
+
+def _history_changed(stored: pd.DataFrame, update: pd.DataFrame) -> bool:
+    """Check whether a compact update disagrees with the store on the bars both cover."""
+    overlap = update[update["Date"] <= stored["Date"].iloc[-1]]
+    if overlap.empty:
+        # Gap longer than the compact window: the update cannot be stitched on
+        return True
+    stored_close = stored.set_index("Date")["adjusted_close"].reindex(overlap["Date"])
+    return not np.allclose(
+        stored_close.to_numpy(), overlap["adjusted_close"].to_numpy(), rtol=OVERLAP_RTOL
+    )
+
+
+def get_daily_adjusted_history(
+    symbol: Annotated[str, "ticker symbol of the company"],
+):
+    """
+    Return the locally maintained TIME_SERIES_DAILY_ADJUSTED series for a symbol,
+    sorted by date, as (frame, raw error response).
+
+    The full history is downloaded once; later calls (at most once per calendar day)
+    fetch only the latest 100 bars and append the new ones. If the overlapping bars
+    were re-adjusted, or the update does not reach back to the stored series, the
+    full history is downloaded again. frame is None when the API answered with
+    something other than CSV data, which is returned as the second element.
+    """
+    path = _store_path(symbol)
+    today = datetime.now().strftime("%Y-%m-%d")
+    frame, meta = read_store(path)
+
+    if frame is not None and not frame.empty and meta.get("checked_on") == today:
+        return frame, None
+
+    if frame is None or frame.empty:
+        frame, response = _fetch_daily_adjusted(symbol, "full")
+        if frame is None:
+            return None, response
+        meta = {"symbol": symbol.upper(), "revision": meta.get("revision", 0) + 1}
+    else:
+        update, response = _fetch_daily_adjusted(symbol, "compact")
+        if update is None:
+            return None, response
+        if _history_changed(frame, update):
+            full, response = _fetch_daily_adjusted(symbol, "full")
+            if full is None:
+                return None, response
+            frame = full
+            meta["revision"] = meta.get("revision", 0) + 1
+        else:
+            update = update[update["Date"] > frame["Date"].iloc[-1]]
+            if not update.empty:
+                frame = pd.concat([frame, update[frame.columns]], ignore_index=True)
+
+    meta["checked_on"] = today
+    write_store(path, frame, meta)
+    return frame, None
+
+
+def get_daily_adjusted_version(
+    symbol: Annotated[str, "ticker symbol of the company"],
+):
+    """Data version of a symbol's local daily series, for keying derived caches."""
+    return file_version(_store_path(symbol))
+
 
 def get_stock(
     symbol: str,
@@ -18,21 +125,17 @@ def get_stock(
     Returns:
         CSV string containing the daily adjusted time series data filtered to the date range.
     """
-    # Parse dates to determine the range
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    today = datetime.now()
-
-    # Choose outputsize based on whether the requested range is within the latest 100 days
-    # Compact returns latest 100 data points, so check if start_date is recent enough
-    days_from_today_to_start = (today - start_dt).days
-    outputsize = "compact" if days_from_today_to_start < 100 else "full"
-
-    params = {
-        "symbol": symbol,
-        "outputsize": outputsize,
-        "datatype": "csv",
-    }
+    frame, response = get_daily_adjusted_history(symbol)
+    if frame is None:
+        return response
 
-    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params)
+    # Binary search the date range in the local series (both ends inclusive)
+    dates = frame["Date"].to_numpy()
+    lo = np.searchsorted(dates, np.datetime64(start_date), "left")
+    hi = np.searchsorted(dates, np.datetime64(end_date), "right")
 
-    return _filter_csv_by_date_range(response, start_date, end_date)
\ No newline at end of file
+    # Same layout as the API response: newest first, original column names
+    window = frame.iloc[lo:hi].iloc[::-1].rename(columns={"Date": "timestamp"})
+    if "volume" in window.columns:
+        window["volume"] = window["volume"].astype(np.int64)
+    return window.to_csv(index=False)
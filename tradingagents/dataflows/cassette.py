@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from typing import Annotated, Callable
+
+from .config import get_config
+from .alpha_vantage_common import AlphaVantageRateLimitError
+
+# config["vendor_replay_mode"] values
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+STRICT = "strict"
+
+
+class CassetteMissError(Exception):
+    """Raised in strict replay mode when a vendor call has no recorded response."""
+    pass
+
+
+class ReplayedVendorError(Exception):
+    """A vendor failure recorded in a cassette, raised again on replay."""
+    pass
+
+
+def replay_mode() -> str:
+    return get_config().get("vendor_replay_mode", OFF) or OFF
+
+
+def _cassette_dir() -> str:
+    config = get_config()
+    return config.get("cassette_dir") or os.path.join(config["data_cache_dir"], "cassettes")
+
+
+def _cassette_path(method: str, vendor: str, impl_name: str, args: tuple, kwargs: dict) -> str:
+    payload = json.dumps([method, vendor, impl_name, list(args), sorted(kwargs.items())], default=str)
+    digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+    return os.path.join(_cassette_dir(), method, vendor, f"{impl_name}-{digest}.json")
+
+
+def _write(path: str, record: dict) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(record, f, default=str)
+    os.replace(tmp_path, path)
+
+
+def _replay(record: dict):
+    scale = get_config().get("replay_latency_scale", 0.0)
+    if scale:
+        time.sleep(record.get("latency", 0.0) * scale)
+    if "error" in record:
+        if record.get("rate_limited"):
+            raise AlphaVantageRateLimitError(record["error"])
+        raise ReplayedVendorError(record["error"])
+    return record["result"]
+
+
+def cassette_call(
+    method: Annotated[str, "routed method name"],
+    vendor: Annotated[str, "vendor name"],
+    impl_func: Callable,
+    args: tuple,
+    kwargs: dict,
+):
+    """
+    Call a vendor implementation through the cassette store, per config["vendor_replay_mode"]:
+
+    - "off": call the vendor.
+    - "record": call the vendor and save its response (or failure) and latency.
+    - "replay": serve recorded responses; a miss calls the vendor and records it.
+    - "strict": serve recorded responses only; a miss raises CassetteMissError.
+
+    Replayed calls sleep for their recorded latency times config["replay_latency_scale"].
+    """
+    mode = replay_mode()
+    if mode == OFF:
+        return impl_func(*args, **kwargs)
+
+    path = _cassette_path(method, vendor, impl_func.__name__, args, kwargs)
+    if mode in (REPLAY, STRICT):
+        try:
+            with open(path, "r") as f:
+                record = json.load(f)
+        except FileNotFoundError:
+            if mode == STRICT:
+                raise CassetteMissError(
+                    f"No recorded response for {method} from '{vendor}' ({impl_func.__name__}) "
+                    f"with args={list(args)} kwargs={kwargs}; expected {path}"
+                )
+        else:
+            return _replay(record)
+
+    record = {
+        "method": method,
+        "vendor": vendor,
+        "impl": impl_func.__name__,
+        "args": list(args),
+        "kwargs": kwargs,
+    }
+    start = time.monotonic()
+    try:
+        result = impl_func(*args, **kwargs)
+    except Exception as e:
+        record["latency"] = time.monotonic() - start
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["rate_limited"] = isinstance(e, AlphaVantageRateLimitError)
+        _write(path, record)
+        raise
+
+    record["latency"] = time.monotonic() - start
+    record["result"] = result if isinstance(result, str) else str(result)
+    _write(path, record)
+    return result
@@ -0,0 +1,142 @@
+import os
+import json
+from bisect import bisect_left, bisect_right
+from typing import Annotated, Iterable
+
+import numpy as np
+
+from .config import get_config
+from .hot_cache import get_hot_cache, file_version
+
+
+def finnhub_data_path(ticker, data_type, data_dir, period=None) -> str:
+    """Path of the processed finnhub JSON file for a ticker and data type."""
+    if period:
+        return os.path.join(
+            data_dir,
+            "finnhub_data",
+            data_type,
+            f"{ticker}_{period}_data_formatted.json",
+        )
+    return os.path.join(
+        data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
+    )
+
+
+def _compact_paths(json_path: str):
+    stem = json_path[: -len(".json")] if json_path.endswith(".json") else json_path
+    return stem + ".dates.npy", stem + ".offsets.npy", stem + ".jsonl"
+
+
+class _JsonIndex:
+    """Date-sorted in-memory index over a parsed finnhub JSON file."""
+
+    def __init__(self, data: dict, nbytes: int = 0):
+        items = sorted((k, v) for k, v in data.items() if len(v) > 0)
+        self.keys = [k for k, _ in items]
+        self.values = [v for _, v in items]
+        # Parsed JSON takes a few times its on-disk size; used for cache accounting
+        self.nbytes = nbytes
+
+    def __sizeof__(self):
+        return self.nbytes
+
+    def range(self, start_date: str, end_date: str) -> dict:
+        lo = bisect_left(self.keys, start_date)
+        hi = bisect_right(self.keys, end_date)
+        return dict(zip(self.keys[lo:hi], self.values[lo:hi]))
+
+
+class _CompactIndex:
+    """
+    Memory-mapped index over the compact format: a sorted array of dates, byte offsets
+    into a JSON-lines file, and the file itself. Only the rows in range are parsed.
+    """
+
+    def __init__(self, json_path: str):
+        dates_path, offsets_path, self.lines_path = _compact_paths(json_path)
+        self.dates = np.load(dates_path, mmap_mode="r")
+        self.offsets = np.load(offsets_path, mmap_mode="r")
+
+    def range(self, start_date: str, end_date: str) -> dict:
+        lo = int(np.searchsorted(self.dates, start_date.encode(), "left"))
+        hi = int(np.searchsorted(self.dates, end_date.encode(), "right"))
+        if lo >= hi:
+            return {}
+        with open(self.lines_path, "rb") as f:
+            f.seek(int(self.offsets[lo]))
+            blob = f.read(int(self.offsets[hi]) - int(self.offsets[lo]))
+        values = [json.loads(line) for line in blob.splitlines()]
+        return dict(zip((d.decode() for d in self.dates[lo:hi]), values))
+
+
+def convert_finnhub_to_compact(
+    json_path: Annotated[str, "path of a processed finnhub JSON file"],
+) -> None:
+    """
+    Write the compact, memory-mappable form of a finnhub JSON file next to it:
+    <stem>.dates.npy (sorted dates), <stem>.offsets.npy (byte offsets) and
+    <stem>.jsonl (one JSON value per date).
+    """
+    with open(json_path, "r") as f:
+        index = _JsonIndex(json.load(f))
+
+    dates_path, offsets_path, lines_path = _compact_paths(json_path)
+    offsets = [0]
+    tmp_lines = lines_path + ".tmp"
+    with open(tmp_lines, "wb") as f:
+        for value in index.values:
+            line = json.dumps(value).encode() + b"\n"
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+
+    with open(dates_path + ".tmp", "wb") as f:
+        np.save(f, np.array(index.keys, dtype="S10"))
+    with open(offsets_path + ".tmp", "wb") as f:
+        np.save(f, np.array(offsets, dtype=np.int64))
+    # The lines file goes last: its mtime marks the compact form as complete
+    os.replace(dates_path + ".tmp", dates_path)
+    os.replace(offsets_path + ".tmp", offsets_path)
+    os.replace(tmp_lines, lines_path)
+
+
+def _compact_is_current(json_path: str) -> bool:
+    json_version = file_version(json_path)
+    compact_version = file_version(_compact_paths(json_path)[2])
+    if compact_version is None:
+        return False
+    return json_version is None or compact_version[0] >= json_version[0]
+
+
+def load_finnhub_index(json_path: str):
+    """
+    Get the cached date index for a finnhub data file.
+    Uses the compact form when it is up to date; otherwise parses the JSON once
+    (optionally converting it when config["finnhub_compact_format"] is set).
+    """
+    if not _compact_is_current(json_path) and get_config().get("finnhub_compact_format"):
+        if os.path.exists(json_path):
+            convert_finnhub_to_compact(json_path)
+
+    cache = get_hot_cache()
+    if _compact_is_current(json_path):
+        key = ("finnhub_compact", json_path, file_version(_compact_paths(json_path)[2]))
+        return cache.get_or_compute(key, lambda: _CompactIndex(json_path))
+
+    def parse():
+        with open(json_path, "r") as f:
+            return _JsonIndex(json.load(f), nbytes=4 * os.path.getsize(json_path))
+
+    return cache.get_or_compute(("finnhub_json", json_path, file_version(json_path)), parse)
+
+
+def dedup_entries(entries: Iterable[dict]) -> list:
+    """Drop repeated entries in O(n) by hashing their canonical JSON form."""
+    seen = set()
+    unique = []
+    for entry in entries:
+        key = json.dumps(entry, sort_keys=True, default=str)
+        if key not in seen:
+            seen.add(key)
+            unique.append(entry)
+    return unique
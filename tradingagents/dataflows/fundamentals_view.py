@@ -0,0 +1,232 @@
+from typing import Annotated, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .telemetry import emit
+from .utils import estimate_tokens
+
+# Canonical line items and their names in each vendor's statements
+LINE_ITEMS = {
+    "revenue": {"yfinance": "Total Revenue", "alpha_vantage": "totalRevenue"},
+    "gross_profit": {"yfinance": "Gross Profit", "alpha_vantage": "grossProfit"},
+    "operating_income": {"yfinance": "Operating Income", "alpha_vantage": "operatingIncome"},
+    "net_income": {"yfinance": "Net Income", "alpha_vantage": "netIncome"},
+    "diluted_eps": {"yfinance": "Diluted EPS"},
+    "total_assets": {"yfinance": "Total Assets", "alpha_vantage": "totalAssets"},
+    "total_liabilities": {
+        "yfinance": "Total Liabilities Net Minority Interest",
+        "alpha_vantage": "totalLiabilities",
+    },
+    "total_equity": {"yfinance": "Stockholders Equity", "alpha_vantage": "totalShareholderEquity"},
+    "total_debt": {"yfinance": "Total Debt", "alpha_vantage": "shortLongTermDebtTotal"},
+    "cash": {
+        "yfinance": "Cash And Cash Equivalents",
+        "alpha_vantage": "cashAndCashEquivalentsAtCarryingValue",
+    },
+    "current_assets": {"yfinance": "Current Assets", "alpha_vantage": "totalCurrentAssets"},
+    "current_liabilities": {"yfinance": "Current Liabilities", "alpha_vantage": "totalCurrentLiabilities"},
+    "operating_cash_flow": {"yfinance": "Operating Cash Flow", "alpha_vantage": "operatingCashflow"},
+    "capital_expenditure": {"yfinance": "Capital Expenditure", "alpha_vantage": "capitalExpenditures"},
+    "cash_flow_net_income": {
+        "yfinance": "Net Income From Continuing Operations",
+        "alpha_vantage": "netIncome",
+    },
+}
+
+# Line items shown per statement unless config["fundamentals_line_items"] overrides them.
+# Entries that are not canonical names are looked up as vendor line items.
+DEFAULT_LINE_ITEMS = {
+    "income_statement": ["revenue", "gross_profit", "operating_income", "net_income", "diluted_eps"],
+    "balance_sheet": [
+        "total_assets", "total_liabilities", "total_equity", "total_debt",
+        "cash", "current_assets", "current_liabilities",
+    ],
+    "cashflow": ["operating_cash_flow", "capital_expenditure", "cash_flow_net_income"],
+}
+
+# Line items every statement's metrics are computed from, whatever the projection
+METRIC_INPUTS = {
+    "income_statement": ["revenue", "gross_profit", "operating_income", "net_income"],
+    "balance_sheet": ["total_assets", "total_liabilities", "total_equity", "total_debt",
+                      "current_assets", "current_liabilities"],
+    "cashflow": ["operating_cash_flow", "capital_expenditure", "cash_flow_net_income"],
+}
+
+# Derived metric name -> display unit ("%" or "x")
+METRIC_UNITS = {
+    "revenue_growth_qoq": "%",
+    "revenue_growth_yoy": "%",
+    "net_income_growth_yoy": "%",
+    "gross_margin": "%",
+    "operating_margin": "%",
+    "net_margin": "%",
+    "debt_to_equity": "x",
+    "liabilities_to_assets": "%",
+    "current_ratio": "x",
+    "equity_growth_yoy": "%",
+    "free_cash_flow": "",
+    "cash_conversion": "x",
+    "fcf_conversion": "x",
+    "operating_cash_flow_growth_yoy": "%",
+}
+
+PER_SHARE_ITEMS = {"diluted_eps"}
+
+_PERIOD_FREQ = {"quarterly": "Q", "annual": "Y"}
+
+# Fiscal periods are keyed by the nearest calendar period end: half a period is
+# added before taking the calendar period, so 52/53-week dates such as 2023-04-01
+# land on the quarter that just ended
+_HALF_PERIOD = {"quarterly": pd.Timedelta(days=45), "annual": pd.Timedelta(days=182)}
+_PERIOD_DAYS = {"quarterly": 91.3, "annual": 365.25}
+
+# A growth comparison is skipped when the two report dates are further than this
+# from the expected distance (e.g. across a fiscal year-end change)
+_GAP_TOLERANCE_DAYS = 20
+
+
+def _line_items(statement: str) -> list:
+    overrides = get_config().get("fundamentals_line_items") or {}
+    return list(overrides.get(statement) or DEFAULT_LINE_ITEMS[statement])
+
+
+def _canonical_frame(rows: pd.DataFrame, vendor: str, items: list) -> pd.DataFrame:
+    """Numeric line items by fiscal period (oldest first), under canonical names."""
+    frame = pd.DataFrame(index=pd.DatetimeIndex(rows["Report Date"]))
+    for item in items:
+        column = LINE_ITEMS.get(item, {}).get(vendor, item)
+        if column in rows.columns:
+            frame[item] = pd.to_numeric(rows[column], errors="coerce").to_numpy()
+    if "capital_expenditure" in frame:
+        # Vendors disagree on the sign of capex; keep it as a cash outflow
+        frame["capital_expenditure"] = -frame["capital_expenditure"].abs()
+    return frame.sort_index()
+
+
+def _growth(values: pd.Series, dates: pd.Series, periods: int, freq: str) -> pd.Series:
+    """
+    Change against the value ``periods`` fiscal periods earlier. Missing periods,
+    and comparisons whose report dates are not about ``periods`` periods apart, stay NaN.
+    """
+    prior = values.shift(periods)
+    gap = (dates - dates.shift(periods)).dt.days
+    aligned = (gap - periods * _PERIOD_DAYS[freq]).abs() <= _GAP_TOLERANCE_DAYS
+    return ((values - prior) / prior.abs()).where(aligned)
+
+
+def _fiscal_periods(index: pd.DatetimeIndex, freq: str) -> pd.PeriodIndex:
+    """Nearest calendar period end for each report date."""
+    return (index + _HALF_PERIOD[freq]).to_period(_PERIOD_FREQ[freq]) - 1
+
+
+def derived_metrics(
+    frame: Annotated[pd.DataFrame, "canonical line items indexed by report date, oldest first"],
+    statement: Annotated[str, "balance_sheet, cashflow or income_statement"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"],
+) -> pd.DataFrame:
+    """
+    Growth, margin, leverage and cash-conversion ratios for every period at once,
+    indexed like ``frame``. Growth compares fiscal periods, so a missing quarter
+    yields NaN rather than comparing against the wrong period. When two reports
+    map to the same fiscal period, only the later one gets metrics.
+    """
+    if frame.empty:
+        return pd.DataFrame(index=frame.index)
+    periods = _fiscal_periods(frame.index, freq)
+    keep = ~periods.duplicated(keep="last")
+    grid = frame[keep].set_axis(periods[keep])
+    full_range = pd.period_range(grid.index.min(), grid.index.max(), freq=grid.index.freq)
+    dates = pd.Series(frame.index[keep], index=grid.index).reindex(full_range)
+    grid = grid.reindex(full_range)
+    col = lambda name: grid[name] if name in grid else pd.Series(np.nan, index=grid.index)
+    growth = lambda values, n: _growth(values, dates, n, freq)
+    yoy = 4 if freq == "quarterly" else 1
+
+    out = pd.DataFrame(index=grid.index)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if statement == "income_statement":
+            revenue = col("revenue")
+            if freq == "quarterly":
+                out["revenue_growth_qoq"] = growth(revenue, 1)
+            out["revenue_growth_yoy"] = growth(revenue, yoy)
+            out["net_income_growth_yoy"] = growth(col("net_income"), yoy)
+            out["gross_margin"] = col("gross_profit") / revenue
+            out["operating_margin"] = col("operating_income") / revenue
+            out["net_margin"] = col("net_income") / revenue
+        elif statement == "balance_sheet":
+            out["debt_to_equity"] = col("total_debt") / col("total_equity")
+            out["liabilities_to_assets"] = col("total_liabilities") / col("total_assets")
+            out["current_ratio"] = col("current_assets") / col("current_liabilities")
+            out["equity_growth_yoy"] = growth(col("total_equity"), yoy)
+        elif statement == "cashflow":
+            operating = col("operating_cash_flow")
+            free_cash_flow = operating + col("capital_expenditure")
+            out["free_cash_flow"] = free_cash_flow
+            out["cash_conversion"] = operating / col("cash_flow_net_income")
+            out["fcf_conversion"] = free_cash_flow / col("cash_flow_net_income")
+            out["operating_cash_flow_growth_yoy"] = growth(operating, yoy)
+
+    # Back from the fiscal grid to report dates
+    out = out.replace([np.inf, -np.inf], np.nan).reindex(periods[keep])
+    return out.set_axis(frame.index[keep]).reindex(frame.index)
+
+
+def _format_row(values: pd.Series, unit: str) -> list:
+    if unit == "%":
+        return [f"{v:.1%}" if pd.notna(v) else "-" for v in values]
+    if unit == "x":
+        return [f"{v:.2f}x" if pd.notna(v) else "-" for v in values]
+    if unit == "per_share":
+        return [f"{v:.2f}" if pd.notna(v) else "-" for v in values]
+    return [f"{v / 1e6:,.1f}" if pd.notna(v) else "-" for v in values]
+
+
+def compact_statement(
+    rows: Annotated[pd.DataFrame, "warehouse filings, one row per period"],
+    vendor: Annotated[str, "vendor whose line-item names the rows use"],
+    statement: Annotated[str, "balance_sheet, cashflow or income_statement"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"],
+    raw_text: Annotated[Optional[str], "the full statement the compact view replaces"] = None,
+) -> str:
+    """
+    Fixed-width table of the projected line items (in millions) and derived
+    metrics for the newest config["fundamentals_view_periods"] periods, newest
+    first. When raw_text is given, a footer reports the prompt tokens saved.
+    """
+    items = _line_items(statement)
+    frame = _canonical_frame(rows, vendor, list(dict.fromkeys(items + METRIC_INPUTS[statement])))
+    metrics = derived_metrics(frame, statement, freq)
+
+    shown = frame.index[::-1][: get_config().get("fundamentals_view_periods", 8)]
+    table = {}
+    for item in items:
+        if item in frame and frame[item].notna().any():
+            unit = "per_share" if item in PER_SHARE_ITEMS else ""
+            table[item] = _format_row(frame[item].reindex(shown), unit)
+    for name in metrics.columns:
+        if metrics[name].notna().any():
+            table[name] = _format_row(metrics[name].reindex(shown), METRIC_UNITS[name])
+
+    table = pd.DataFrame.from_dict(table, orient="index", columns=shown.strftime("%Y-%m-%d"))
+    text = (
+        "# Amounts in millions of reporting currency (per-share items in units); "
+        "growth is vs the same fiscal period (yoy) or the prior quarter (qoq)\n"
+        + table.to_string()
+        + "\n"
+    )
+
+    if raw_text is not None:
+        raw_tokens, tokens = estimate_tokens(raw_text), estimate_tokens(text)
+        saved = raw_tokens - tokens
+        text += f"\n# Compact view: {tokens:,} tokens (full statement {raw_tokens:,}; saved {saved:,})\n"
+        emit(
+            "fundamentals.compact", "debug", vendor=vendor, statement=statement,
+            raw_tokens=raw_tokens, tokens=tokens, saved=saved,
+        )
+    return text
+
+
+def compact_enabled() -> bool:
+    return get_config().get("fundamentals_view", "compact") == "compact"
@@ -0,0 +1,235 @@
+import os
+import time
+import tempfile
+import threading
+from typing import Annotated, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .hot_cache import get_hot_cache, file_version
+from .simfin_store import get_publish_dates
+from .telemetry import emit
+
+# SimFin statement holding the real publish dates for each warehouse statement
+SIMFIN_STATEMENTS = {
+    "balance_sheet": "balance_sheet",
+    "cashflow": "cash_flow",
+    "income_statement": "income_statements",
+}
+
+PERIOD_MONTHS = {"quarterly": 3, "annual": 12}
+
+# Filing deadlines used when a vendor gives no publish date (10-Q: 40-45 days, 10-K: 60-90 days)
+DEFAULT_PUBLISH_LAG_DAYS = {"quarterly": 45, "annual": 90}
+
+# Columns kept for every filing, ahead of the vendor's line items.
+# "Publish Basis" is "simfin" (real publish date), "estimated" (period end + lag)
+# or "observed" (first seen in a vendor response before the estimated date).
+META_COLUMNS = ["Report Date", "Publish Date", "Publish Basis", "Vendor"]
+
+_path_locks = {}
+_path_locks_guard = threading.Lock()
+
+
+def _path_lock(path: str) -> threading.Lock:
+    with _path_locks_guard:
+        return _path_locks.setdefault(path, threading.Lock())
+
+
+def _warehouse_path(vendor: str, statement: str, freq: str, ticker: str) -> str:
+    config = get_config()
+    return os.path.join(
+        config["data_cache_dir"],
+        "fundamentals_warehouse",
+        vendor,
+        statement,
+        freq,
+        f"{ticker.upper().replace(os.sep, '_')}.pkl",
+    )
+
+
+def _load(path: str):
+    stored = pd.read_pickle(path)
+    rows = stored["rows"]
+    return rows, stored["meta"], rows["Publish Date"].to_numpy(dtype="datetime64[ns]")
+
+
+def _read(path: str):
+    """Returns (rows, meta, publish_index); rows is None when nothing is stored yet."""
+    version = file_version(path)
+    if version is None:
+        return None, {}, None
+    return get_hot_cache().get_or_compute(("fundamentals", path, version), lambda: _load(path))
+
+
+def _write(path: str, rows: pd.DataFrame, meta: dict) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pd.to_pickle({"rows": rows, "meta": meta}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _publish_lag(freq: str) -> pd.Timedelta:
+    lags = get_config().get("fundamentals_publish_lag_days") or {}
+    return pd.Timedelta(days=lags.get(freq, DEFAULT_PUBLISH_LAG_DAYS[freq]))
+
+
+def _simfin_publish_dates(statement: str, ticker: str, freq: str) -> pd.Series:
+    """Real publish dates from the local SimFin files, when they are available."""
+    try:
+        return get_publish_dates(get_config()["data_dir"], SIMFIN_STATEMENTS[statement], ticker, freq)
+    except (FileNotFoundError, KeyError):
+        return pd.Series(dtype="datetime64[ns]")
+
+
+def _normalize_dates(values) -> pd.Series:
+    dates = pd.to_datetime(pd.Series(values), errors="coerce")
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.dt.normalize()
+
+
+def _merge(
+    stored: Optional[pd.DataFrame],
+    fetched: pd.DataFrame,
+    vendor: str,
+    statement: str,
+    ticker: str,
+    freq: str,
+    fetched_on: pd.Timestamp,
+) -> pd.DataFrame:
+    """
+    Add newly fetched filings to the stored ones. Filings the vendor no longer
+    returns are kept, so history grows past the vendor's window. A stored filing
+    keeps the line items it was first seen with: the vendor's current figures may
+    be restatements published long after the original filing, and as-of queries
+    must not see them. Only its publish date is upgraded once SimFin knows it.
+    """
+    fetched = fetched.copy()
+    fetched["Report Date"] = _normalize_dates(fetched["Report Date"]).to_numpy()
+    fetched = fetched.dropna(subset=["Report Date"]).drop_duplicates("Report Date", keep="first")
+    if stored is not None and not stored.empty:
+        fetched = fetched[~fetched["Report Date"].isin(stored["Report Date"])]
+
+    report = fetched["Report Date"]
+    estimated = report + _publish_lag(freq)
+    publish = estimated.where(estimated <= fetched_on, fetched_on)
+    basis = pd.Series(np.where(estimated <= fetched_on, "estimated", "observed"), index=fetched.index)
+
+    known = _simfin_publish_dates(statement, ticker, freq)
+    if not known.empty:
+        real = report.map(known)
+        publish = real.where(real.notna(), publish)
+        basis = basis.where(real.isna(), "simfin")
+
+    fetched["Publish Date"] = publish.to_numpy()
+    fetched["Publish Basis"] = basis.to_numpy()
+    fetched["Vendor"] = vendor
+
+    items = [c for c in fetched.columns if c not in META_COLUMNS]
+    if stored is not None and not stored.empty:
+        kept = stored.copy()
+        if not known.empty:
+            real = kept["Report Date"].map(known)
+            kept["Publish Date"] = real.where(real.notna(), kept["Publish Date"])
+            kept["Publish Basis"] = kept["Publish Basis"].where(real.isna(), "simfin")
+        items = [c for c in stored.columns if c not in META_COLUMNS] + [
+            c for c in items if c not in stored.columns
+        ]
+        fetched = pd.concat([kept, fetched], ignore_index=True)
+
+    rows = fetched[META_COLUMNS + items]
+    return rows.sort_values(["Publish Date", "Report Date"], kind="stable").reset_index(drop=True)
+
+
+def _next_expected(rows: pd.DataFrame, freq: str, fetched_on: pd.Timestamp) -> pd.Timestamp:
+    """Estimated publish date of the next filing after the latest stored period."""
+    if rows.empty:
+        return fetched_on
+    last_period = rows["Report Date"].max()
+    return last_period + pd.DateOffset(months=PERIOD_MONTHS[freq]) + _publish_lag(freq)
+
+
+def _needs_refresh(meta: dict, as_of: pd.Timestamp, now: float) -> bool:
+    if not meta:
+        return True
+    fetched_on = pd.Timestamp(meta["fetched_at"], unit="s").normalize()
+    # Everything published by as_of was already public at the last fetch
+    if as_of < fetched_on:
+        return False
+    if pd.Timestamp(now, unit="s") < pd.Timestamp(meta["next_expected"]):
+        return False
+    # A filing is due; ask the vendor again at most once per retry interval
+    return now - meta["fetched_at"] >= get_config().get("fundamentals_refresh_retry", 86400)
+
+
+def get_statement_as_of(
+    vendor: Annotated[str, "vendor that supplies the statements, e.g. yfinance"],
+    ticker: Annotated[str, "ticker symbol"],
+    statement: Annotated[str, "balance_sheet, cashflow or income_statement"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"],
+    curr_date: Annotated[Optional[str], "current date you are trading at, yyyy-mm-dd (None for today)"],
+    fetch: Annotated[
+        Callable[[], Optional[pd.DataFrame]],
+        "returns the vendor's filings, one row per period with a 'Report Date' column, or None",
+    ],
+) -> Optional[pd.DataFrame]:
+    """
+    Return the filings published on or before curr_date, newest period first, or None.
+
+    Filings are stored per (vendor, statement, freq, ticker) under
+    data_cache_dir/fundamentals_warehouse with their publish date: the SimFin
+    publish date when the local SimFin files have the period, otherwise the
+    period end plus config["fundamentals_publish_lag_days"]. The as-of cut is a
+    binary search over the publish-date index. The vendor is called again only
+    for dates after the last successful fetch once the next filing is expected;
+    if that call fails, the stored filings are used.
+    """
+    as_of = pd.Timestamp(curr_date).normalize() if curr_date else pd.Timestamp.now().normalize()
+    path = _warehouse_path(vendor, statement, freq, ticker)
+
+    with _path_lock(path):
+        rows, meta, publish = _read(path)
+        now = time.time()
+        if _needs_refresh(meta, as_of, now):
+            try:
+                fetched = fetch()
+            except Exception as e:
+                if rows is None:
+                    raise
+                # Answer from the stored filings; the next call retries the vendor
+                emit(
+                    "fundamentals.fetch_failed", "warning", vendor=vendor, ticker=ticker.upper(),
+                    statement=statement, freq=freq, error=str(e),
+                )
+                fetched = None
+            # Only a successful fetch counts as one, so failures are retried
+            if fetched is not None:
+                fetched_on = pd.Timestamp(now, unit="s").normalize()
+                rows = _merge(rows, fetched, vendor, statement, ticker, freq, fetched_on)
+                meta = {
+                    "vendor": vendor,
+                    "ticker": ticker.upper(),
+                    "statement": statement,
+                    "freq": freq,
+                    "fetched_at": now,
+                    "next_expected": _next_expected(rows, freq, fetched_on).strftime("%Y-%m-%d"),
+                }
+                _write(path, rows, meta)
+                rows, meta, publish = _read(path)
+
+    if rows is None:
+        return None
+    end = np.searchsorted(publish, np.datetime64(as_of), "right")
+    if end == 0:
+        return None
+    return rows.iloc[:end].sort_values("Report Date", ascending=False, kind="stable")
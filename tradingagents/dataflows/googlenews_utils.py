@@ -1,16 +1,37 @@
+import os
+import re
 import json
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
 import time
 import random
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception_type,
-    retry_if_result,
-)
+import asyncio
+import tempfile
+import requests
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import quote_plus
+
+from .config import get_config
+
+try:
+    import lxml  # noqa: F401
+
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+# Retries for rate-limited (429) pages: exponential backoff between 4 and 60 seconds
+MAX_ATTEMPTS = 5
+BACKOFF_MIN = 4
+BACKOFF_MAX = 60
 
 
 def is_rate_limited(response):
@@ -18,91 +39,268 @@ def is_rate_limited(response):
     return response.status_code == 429
 
 
-@retry(
-    retry=(retry_if_result(is_rate_limited)),
-    wait=wait_exponential(multiplier=1, min=4, max=60),
-    stop=stop_after_attempt(5),
-)
-def make_request(url, headers):
-    """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
-    return response
+def _to_date(value: str) -> datetime:
+    if "-" in value:
+        return datetime.strptime(value, "%Y-%m-%d")
+    return datetime.strptime(value, "%m/%d/%Y")
 
 
-def getNewsData(query, start_date, end_date):
+# Relative result dates ("5 hours ago") and their unit lengths; months are too coarse to place
+_RELATIVE_DATE = re.compile(r"(\d+)\s+(min|minute|hour|day|week)s?\s+ago", re.IGNORECASE)
+_RELATIVE_UNITS = {
+    "min": timedelta(minutes=1),
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+}
+_ABSOLUTE_DATE_FORMATS = ("%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y")
+
+
+def result_day(date_text: str, now: datetime):
+    """Calendar day a result's date label refers to, or None if it cannot be placed."""
+    text = date_text.strip()
+    match = _RELATIVE_DATE.fullmatch(text)
+    if match:
+        moment = now - int(match.group(1)) * _RELATIVE_UNITS[match.group(2).lower()]
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    for fmt in _ABSOLUTE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def parse_results(html: bytes):
     """
-    Scrape Google News search results for a given query and date range.
-    query: str - search query
-    start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
-    end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    Parse one Google News results page.
+    Returns (results, has_next_page); results are dicts with link, title, snippet, date and source.
     """
-    if "-" in start_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        start_date = start_date.strftime("%m/%d/%Y")
-    if "-" in end_date:
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        end_date = end_date.strftime("%m/%d/%Y")
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    soup = BeautifulSoup(html, _PARSER)
+    news_results = []
+    for el in soup.select("div.SoaBEf"):
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+    return news_results, soup.find("a", id="pnnext") is not None
+
 
+class _Politeness:
+    """
+    Request budget shared by every page fetch of one scrape: at most
+    max_concurrency requests in flight, and request starts spaced at least
+    min_interval seconds apart (plus random jitter).
+    """
+
+    def __init__(self, max_concurrency: int, min_interval: float, jitter: float):
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def wait_turn(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval + random.uniform(0, self.jitter)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def _fetch_page(url: str, politeness: _Politeness) -> bytes:
+    """Fetch one page within the politeness budget, backing off on rate limits."""
+    for attempt in range(MAX_ATTEMPTS):
+        async with politeness.semaphore:
+            await politeness.wait_turn()
+            response = await asyncio.to_thread(
+                requests.get, url, headers=HEADERS, timeout=get_config().get("http_timeout", 30)
+            )
+        if not is_rate_limited(response):
+            return response.content
+        await asyncio.sleep(min(BACKOFF_MAX, max(BACKOFF_MIN, 2 ** attempt)))
+    raise RuntimeError(f"Rate limited after {MAX_ATTEMPTS} attempts: {url}")
+
+
+async def _scrape_range(query: str, start: datetime, end: datetime, politeness: _Politeness):
+    """
+    Scrape every results page for one date range; pages are parsed off the event loop.
+    Returns (results, complete); complete is False when a page could not be fetched.
+    """
+    cd_min, cd_max = start.strftime("%m/%d/%Y"), end.strftime("%m/%d/%Y")
     news_results = []
     page = 0
     while True:
         offset = page * 10
         url = (
             f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+            f"&tbs=cdr:1,cd_min:{cd_min},cd_max:{cd_max}"
             f"&tbm=nws&start={offset}"
         )
 
         try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
-
-            page += 1
-
+            html = await _fetch_page(url, politeness)
+            results_on_page, has_next = await asyncio.to_thread(parse_results, html)
         except Exception as e:
             print(f"Failed after multiple retries: {e}")
+            return news_results, False
+
+        if not results_on_page:
+            break  # No more results found
+        news_results.extend(results_on_page)
+
+        # Check for the "Next" link (pagination)
+        if not has_next:
             break
+        page += 1
+
+    return news_results, True
+
+
+def _day_cache_path(query: str, day: datetime) -> str:
+    config = get_config()
+    return os.path.join(
+        config["data_cache_dir"],
+        "google_news",
+        quote_plus(query, safe=""),
+        f"{day.strftime('%Y-%m-%d')}.json",
+    )
+
+
+def _read_day(query: str, day: datetime):
+    try:
+        with open(_day_cache_path(query, day), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_day(query: str, day: datetime, results: list) -> None:
+    path = _day_cache_path(query, day)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(results, f)
+    os.replace(tmp_path, path)
+
+
+def _spans(days: list) -> list:
+    """Group days (newest first) into runs of consecutive days."""
+    spans = []
+    for day in days:
+        if spans and spans[-1][-1] - day == timedelta(days=1):
+            spans[-1].append(day)
+        else:
+            spans.append([day])
+    return spans
+
+
+async def _scrape_span(query: str, span: list, politeness: _Politeness, daily_span: int):
+    """
+    Scrape a run of uncached days (newest first). Short runs are scraped one day at
+    a time; longer ones with a single range query, as one request series for the
+    whole run puts less load on Google than one per day. Range results are split
+    into days by their date labels. Returns (results by day or None, unplaced results).
+    """
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if len(span) <= daily_span:
+        scraped = await asyncio.gather(*(_scrape_range(query, day, day, politeness) for day in span))
+        by_day = {}
+        for day, (results, complete) in zip(span, scraped):
+            by_day[day] = results
+            # Days still in progress may gain articles; only closed, fully scraped days are cached
+            if complete and day < today:
+                _write_day(query, day, results)
+        return by_day, []
+
+    results, complete = await _scrape_range(query, span[-1], span[0], politeness)
+    now = datetime.now()
+    by_day = {day: [] for day in span}
+    for news in results:
+        day = result_day(news["date"], now)
+        if day not in by_day:
+            # A result that cannot be placed in the run: keep it, but cache nothing
+            return None, results
+        by_day[day].append(news)
+    if complete:
+        for day in span:
+            if day < today:
+                _write_day(query, day, by_day[day])
+    return by_day, []
 
+
+async def get_news_data_async(query, start_date, end_date):
+    """
+    Scrape Google News for a query, newest day first.
+
+    Each completed day (before today) is cached under data_cache_dir/google_news,
+    so a sliding lookback window only scrapes the days it has not seen. Runs of
+    up to config["google_news_daily_span"] uncached days are scraped per day and
+    concurrently; longer runs (a cold window) with one range query. Requests stay
+    within the budget set by config["google_news_max_concurrency"] and
+    config["google_news_min_interval"].
+    """
+    config = get_config()
+    politeness = _Politeness(
+        config.get("google_news_max_concurrency", 2),
+        config.get("google_news_min_interval", 2.0),
+        config.get("google_news_jitter", 2.0),
+    )
+    daily_span = config.get("google_news_daily_span", 3)
+
+    start, end = _to_date(start_date), _to_date(end_date)
+    days = [end - timedelta(days=i) for i in range((end - start).days + 1)]
+
+    cached = {day: _read_day(query, day) for day in days}
+    missing = [day for day in days if cached[day] is None]
+    scraped = await asyncio.gather(
+        *(_scrape_span(query, span, politeness, daily_span) for span in _spans(missing))
+    )
+    unplaced = []
+    for by_day, extra in scraped:
+        cached.update(by_day or {})
+        unplaced.extend(extra)
+
+    news_results = []
+    seen = set()
+    for news in [n for day in days for n in cached[day] or []] + unplaced:
+        if news["link"] not in seen:
+            seen.add(news["link"])
+            news_results.append(news)
     return news_results
+
+
+def getNewsData(query, start_date, end_date):
+    """
+    Scrape Google News search results for a given query and date range.
+    query: str - search query
+    start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
+    end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(get_news_data_async(query, start_date, end_date))
+    # Called from inside an event loop: run the scrape on its own loop in a thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(
+            lambda: asyncio.run(get_news_data_async(query, start_date, end_date))
+        ).result()
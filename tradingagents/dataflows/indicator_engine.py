@@ -0,0 +1,359 @@
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+
+from .trading_calendar import trading_days
+
+# Indicators computed by the engine, with the descriptions returned to the analysts
+INDICATOR_DESCRIPTIONS = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
+
+
+# Window parameters, matching the stockstats defaults for each indicator
+SMA_WINDOWS = {"close_50_sma": 50, "close_200_sma": 200}
+EMA_WINDOWS = {"close_10_ema": 10}
+MACD_WINDOWS = (12, 26, 9)  # short, long, signal
+RSI_WINDOW = 14
+BOLL_WINDOW = 20
+BOLL_STD_TIMES = 2
+ATR_WINDOW = 14
+VWMA_WINDOW = 14
+MFI_WINDOW = 14
+
+# Block length for the blocked EWM recursion; w ** -64 stays finite for every alpha used here
+_EWM_BLOCK = 64
+
+# Price bars needed before a new bar to extend every rolling indicator
+# (the longest window, plus one bar for the typical-price difference in MFI)
+TAIL_BARS = max(max(SMA_WINDOWS.values()), BOLL_WINDOW, VWMA_WINDOW, MFI_WINDOW + 1)
+
+
+def _ewm_mean(x: np.ndarray, alpha: float, carry=(0.0, 0.0)):
+    """
+    Adjusted exponentially weighted mean (pandas ``ewm(adjust=True).mean()``).
+
+    The recursion num_t = x_t + w * num_{t-1} (and den_t likewise with x_t = 1) is
+    evaluated in fixed-size blocks with a rescaled cumsum, so the work stays in
+    vectorized NumPy while the rescaling never overflows. ``carry`` is the
+    (num, den) state after the previous bar; the state after the last bar is
+    returned alongside the means so the series can be extended later.
+    """
+    w = 1.0 - alpha
+    n = len(x)
+    num = np.empty(n)
+    den = np.empty(n)
+    powers = w ** np.arange(_EWM_BLOCK)
+    inv_powers = 1.0 / powers
+
+    carry_num, carry_den = carry
+    for start in range(0, n, _EWM_BLOCK):
+        seg = x[start:start + _EWM_BLOCK]
+        m = len(seg)
+        num[start:start + m] = powers[:m] * (w * carry_num + np.cumsum(seg * inv_powers[:m]))
+        den[start:start + m] = powers[:m] * (w * carry_den + np.cumsum(inv_powers[:m]))
+        carry_num = num[start + m - 1]
+        carry_den = den[start + m - 1]
+
+    return num / den, (float(carry_num), float(carry_den))
+
+
+def _ema(x: np.ndarray, window: int, carry=(0.0, 0.0)):
+    return _ewm_mean(x, 2.0 / (window + 1), carry)
+
+
+def _smma(x: np.ndarray, window: int, carry=(0.0, 0.0)):
+    return _ewm_mean(x, 1.0 / window, carry)
+
+
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum with min_periods=1."""
+    csum = np.cumsum(x)
+    out = csum.copy()
+    out[window:] = csum[window:] - csum[:-window]
+    return out
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean with min_periods=1."""
+    counts = np.minimum(np.arange(1, len(x) + 1), window)
+    return _rolling_sum(x, window) / counts
+
+
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sample standard deviation (ddof=1) with min_periods=1."""
+    n = len(x)
+    out = np.full(n, np.nan)
+    head = min(window - 1, n)
+    if head > 1:
+        # Partial windows at the start of the series
+        csum = np.cumsum(x[:head])
+        csq = np.cumsum(x[:head] ** 2)
+        counts = np.arange(1, head + 1)
+        var = (csq - csum ** 2 / counts)[1:] / (counts[1:] - 1)
+        out[1:head] = np.sqrt(np.maximum(var, 0.0))
+    if n >= window:
+        windows = np.lib.stride_tricks.sliding_window_view(x, window)
+        out[window - 1:] = windows.std(axis=1, ddof=1)
+    return out
+
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    for col in frame.columns:
+        if str(col).lower() == name:
+            return np.ascontiguousarray(frame[col].to_numpy(dtype=np.float64))
+    raise KeyError(f"Price frame has no '{name}' column")
+
+
+def _price_arrays(frame: pd.DataFrame):
+    return (
+        _column(frame, "close"),
+        _column(frame, "high"),
+        _column(frame, "low"),
+        _column(frame, "volume"),
+    )
+
+
+def _compute(close, high, low, volume, first_new: int, offset: int, state: dict):
+    """
+    Core indicator pass over a segment of price arrays.
+
+    The segment holds ``first_new`` bars of context followed by the bars to compute.
+    ``offset`` is the absolute position of the segment's first bar in the full
+    history, and ``state`` carries the recursive (EWM) state after the last context
+    bar. Returns ({name: values for the new bars}, state after the last bar).
+    """
+    n = len(close)
+    new_state = {}
+
+    def ewm(name, fn, x, window):
+        values, new_state[name] = fn(x[first_new:], window, tuple(state.get(name, (0.0, 0.0))))
+        return values
+
+    def rolling(values):
+        return values[first_new:]
+
+    out = {}
+    for name, window in SMA_WINDOWS.items():
+        out[name] = rolling(_rolling_mean(close, window))
+    for name, window in EMA_WINDOWS.items():
+        out[name] = ewm(name, _ema, close, window)
+
+    short_w, long_w, signal_w = MACD_WINDOWS
+    macd = ewm("macd_short", _ema, close, short_w) - ewm("macd_long", _ema, close, long_w)
+    macds, new_state["macds"] = _ema(macd, signal_w, tuple(state.get("macds", (0.0, 0.0))))
+    out["macd"] = macd
+    out["macds"] = macds
+    out["macdh"] = macd - macds
+
+    diff = np.zeros(n)
+    diff[1:] = np.diff(close)
+    up = ewm("rsi_up", _smma, np.where(diff > 0, diff, 0.0), RSI_WINDOW)
+    down = ewm("rsi_down", _smma, np.where(diff < 0, -diff, 0.0), RSI_WINDOW)
+    total = up + down
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(total != 0, 100 * (up / total), 50.0)
+    if offset + first_new == 0 and len(rsi):
+        rsi[0] = 50.0
+    out["rsi"] = rsi
+
+    boll = _rolling_mean(close, BOLL_WINDOW)
+    width = BOLL_STD_TIMES * _rolling_std(close, BOLL_WINDOW)
+    out["boll"] = rolling(boll)
+    out["boll_ub"] = rolling(boll + width)
+    out["boll_lb"] = rolling(boll - width)
+
+    prev_close = np.empty(n)
+    if n:
+        prev_close[0] = close[0]
+        prev_close[1:] = close[:-1]
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    out["atr"] = ewm("atr", _smma, np.nan_to_num(tr), ATR_WINDOW)
+
+    tp = (close + high + low) / 3.0
+    rolling_tpv = _rolling_sum(tp * volume, VWMA_WINDOW)
+    rolling_vol = _rolling_sum(volume, VWMA_WINDOW)
+    out["vwma"] = rolling(
+        np.divide(rolling_tpv, rolling_vol, out=np.zeros(n), where=rolling_vol != 0)
+    )
+
+    money_flow = tp * volume
+    tp_diff = np.zeros(n)
+    tp_diff[1:] = np.diff(tp)
+    pos_sum = _rolling_sum(np.where(tp_diff > 0, money_flow, 0.0), MFI_WINDOW)
+    neg_sum = _rolling_sum(np.where(tp_diff < 0, money_flow, 0.0), MFI_WINDOW)
+    flow = pos_sum + neg_sum
+    mfi = np.divide(pos_sum, flow, out=np.full(n, 0.5), where=flow > 0)
+    mfi[:max(0, MFI_WINDOW - offset)] = 0.5
+    out["mfi"] = rolling(mfi)
+
+    return out, new_state
+
+
+def _indicator_frame(values: dict, dates) -> pd.DataFrame:
+    dates = pd.to_datetime(pd.Series(dates)).dt.normalize()
+    return pd.DataFrame(
+        {name: values[name] for name in INDICATOR_DESCRIPTIONS},
+        index=pd.DatetimeIndex(dates.to_numpy(), name="Date"),
+    )
+
+
+def compute_indicators_with_state(
+    frame: Annotated[pd.DataFrame, "daily OHLCV bars with a Date column, oldest first"],
+):
+    """
+    Compute every indicator over the full history.
+    Returns (indicator frame, state), where state can extend the series via extend_indicators.
+    """
+    values, state = _compute(*_price_arrays(frame), first_new=0, offset=0, state={})
+    return _indicator_frame(values, frame[_date_column(frame)]), state
+
+
+def compute_indicators(
+    frame: Annotated[pd.DataFrame, "daily OHLCV bars with a Date column, oldest first"],
+) -> pd.DataFrame:
+    """
+    Compute every indicator in INDICATOR_DESCRIPTIONS in one pass over contiguous arrays.
+    Values match stockstats' definitions. Returns a frame indexed by date.
+    """
+    return compute_indicators_with_state(frame)[0]
+
+
+def extend_indicators(
+    frame: Annotated[pd.DataFrame, "full daily OHLCV history, oldest first"],
+    n_done: Annotated[int, "number of leading bars already covered by state"],
+    state: Annotated[dict, "recursive state after bar n_done - 1"],
+):
+    """
+    Compute indicators only for bars n_done onwards, using the previous TAIL_BARS
+    bars as rolling-window context and the carried EWM state for recursive series.
+    The cost depends on the number of new bars, not on the length of the history.
+    Returns (indicator frame for the new bars, state after the last bar).
+    """
+    start = max(0, n_done - TAIL_BARS)
+    segment = frame.iloc[start:]
+    values, new_state = _compute(
+        *_price_arrays(segment), first_new=n_done - start, offset=start, state=state
+    )
+    return _indicator_frame(values, segment[_date_column(segment)].iloc[n_done - start:]), new_state
+
+
+def _date_column(frame: pd.DataFrame) -> str:
+    for col in frame.columns:
+        if str(col).lower() == "date":
+            return col
+    raise KeyError("Price frame has no 'Date' column")
+
+
+def indicator_window(
+    values: Annotated[pd.Series, "indicator series indexed by date"],
+    start: Annotated[pd.Timestamp, "first calendar day of the window"],
+    end: Annotated[pd.Timestamp, "last calendar day of the window"],
+) -> str:
+    """
+    Render one line per NYSE trading day from end back to start by slicing the
+    series on its date index. Trading days without a value are reported as N/A.
+    """
+    days = trading_days(start, end)[::-1]
+    if len(days) == 0:
+        return ""
+    window = values[(values.index >= days[-1]) & (values.index <= days[0])]
+    window = window[~window.index.duplicated(keep="last")].reindex(days)
+
+    lines = []
+    for day, value in zip(days.strftime("%Y-%m-%d"), window.to_numpy()):
+        lines.append(f"{day}: {'N/A' if pd.isna(value) else value}\n")
+    return "".join(lines)
+
+
+def indicator_table(
+    values: Annotated[pd.DataFrame, "indicator columns indexed by date"],
+    start: Annotated[pd.Timestamp, "first calendar day of the window"],
+    end: Annotated[pd.Timestamp, "last calendar day of the window"],
+    descriptions: Annotated[dict, "indicator name -> description"],
+    title: Annotated[str, "heading for the table"],
+) -> str:
+    """
+    Render several indicators as one date x indicator CSV table over NYSE trading
+    days, newest first, with each description once as a comment line above it.
+    """
+    days = trading_days(start, end)[::-1]
+    window = values[(values.index >= start.normalize()) & (values.index <= end.normalize())]
+    window = window[~window.index.duplicated(keep="last")].reindex(days)
+    window.index.name = "date"
+
+    header = f"## {title}\n"
+    header += "".join(f"# {name}: {descriptions.get(name, 'No description available.')}\n" for name in window.columns)
+    if window.empty:
+        return header + "\nNo trading days in the specified date range.\n"
+    return header + "\n" + window.to_csv(date_format="%Y-%m-%d", float_format="%.4f", na_rep="N/A")
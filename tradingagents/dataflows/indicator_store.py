@@ -0,0 +1,67 @@
+import os
+from typing import Annotated
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .price_store import read_store, write_store, sync_price_history
+from .indicator_engine import compute_indicators_with_state, extend_indicators
+
+
+def _store_path(symbol: str) -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "indicator_store", f"{symbol.upper()}.npz")
+
+
+def _is_stale(prices: pd.DataFrame, price_meta: dict, meta: dict) -> bool:
+    """
+    Check whether stored indicators no longer describe a prefix of the price history.
+    A new price store revision, or a changed last covered bar, means history was
+    re-adjusted (split/dividend) and everything must be recomputed.
+    """
+    n_bars = meta.get("n_bars", 0)
+    if meta.get("price_revision") != price_meta.get("revision"):
+        return True
+    if n_bars == 0 or n_bars > len(prices):
+        return True
+    last = prices.iloc[n_bars - 1]
+    if last["Date"].strftime("%Y-%m-%d") != meta.get("last_date"):
+        return True
+    return not np.isclose(last["Close"], meta.get("last_close"), rtol=1e-9)
+
+
+def get_indicator_history(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> pd.DataFrame:
+    """
+    Return the materialized indicator series for a symbol, indexed by date.
+
+    Series are persisted per symbol together with the recursive indicator state
+    at their last bar. When the price store gains new bars, only those bars are
+    computed; a full rebuild happens only when the stored history is stale.
+    """
+    prices, price_meta = sync_price_history(symbol)
+    path = _store_path(symbol)
+    stored, meta = read_store(path)
+
+    if stored is None or _is_stale(prices, price_meta, meta):
+        indicators, state = compute_indicators_with_state(prices)
+    elif meta["n_bars"] == len(prices):
+        return stored.set_index("Date")
+    else:
+        new_rows, state = extend_indicators(prices, meta["n_bars"], meta["state"])
+        indicators = pd.concat([stored.set_index("Date"), new_rows])
+
+    if len(prices):
+        meta = {
+            "symbol": symbol.upper(),
+            "price_revision": price_meta.get("revision"),
+            "n_bars": len(prices),
+            "last_date": prices["Date"].iloc[-1].strftime("%Y-%m-%d"),
+            "last_close": float(prices["Close"].iloc[-1]),
+            "state": state,
+        }
+        write_store(path, indicators.reset_index(), meta)
+
+    return indicators
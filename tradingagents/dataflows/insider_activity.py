@@ -0,0 +1,210 @@
+from typing import Annotated, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+# Columns of a normalized transaction frame. shares and value are signed:
+# positive for open-market buys, negative for sells, and 0 for awards, gifts,
+# option exercises and other transactions that are not trades.
+TRANSACTION_COLUMNS = ["date", "insider", "kind", "shares", "price", "value"]
+
+BUY = "buy"
+SELL = "sell"
+OTHER = "other"
+
+# Finnhub / SEC Form 4 transaction codes for open-market trades
+_FINNHUB_KINDS = {"P": BUY, "S": SELL}
+
+
+def _finish(frame: pd.DataFrame) -> pd.DataFrame:
+    frame["date"] = pd.to_datetime(frame["date"], errors="coerce").dt.normalize()
+    frame["shares"] = pd.to_numeric(frame["shares"], errors="coerce").abs().fillna(0.0)
+    frame["price"] = pd.to_numeric(frame["price"], errors="coerce")
+    sign = np.select([frame["kind"] == BUY, frame["kind"] == SELL], [1.0, -1.0], 0.0)
+    frame["value"] = frame["value"].abs().fillna(frame["shares"] * frame["price"].fillna(0.0)) * sign
+    frame["shares"] = frame["shares"] * sign
+    frame = frame.dropna(subset=["date"])
+    return frame[TRANSACTION_COLUMNS].sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def from_yfinance(data: pd.DataFrame) -> pd.DataFrame:
+    """Normalize yfinance ``insider_transactions``; the trade direction is parsed from its Text column."""
+    text = data["Text"].fillna("").astype(str)
+    shares = pd.to_numeric(data["Shares"], errors="coerce")
+    value = pd.to_numeric(data["Value"], errors="coerce")
+    frame = pd.DataFrame(
+        {
+            "date": data["Start Date"],
+            "insider": data["Insider"].astype(str),
+            "kind": np.select(
+                [text.str.contains("Purchase|Buy", case=False), text.str.contains("Sale", case=False)],
+                [BUY, SELL],
+                OTHER,
+            ),
+            "shares": shares,
+            "price": value / shares.where(shares != 0),
+            "value": value,
+        }
+    )
+    return _finish(frame)
+
+
+def from_alpha_vantage(records: list) -> pd.DataFrame:
+    """
+    Normalize Alpha Vantage INSIDER_TRANSACTIONS records. Acquisitions and
+    disposals at a zero price are grants and withholdings, not trades.
+    """
+    data = pd.DataFrame(records, columns=[
+        "transaction_date", "executive", "acquisition_or_disposal", "shares", "share_price",
+    ])
+    price = pd.to_numeric(data["share_price"], errors="coerce")
+    traded = price > 0
+    frame = pd.DataFrame(
+        {
+            "date": data["transaction_date"],
+            "insider": data["executive"].astype(str),
+            "kind": np.select(
+                [traded & (data["acquisition_or_disposal"] == "A"),
+                 traded & (data["acquisition_or_disposal"] == "D")],
+                [BUY, SELL],
+                OTHER,
+            ),
+            "shares": data["shares"],
+            "price": price,
+            "value": np.nan,
+        }
+    )
+    return _finish(frame)
+
+
+def from_finnhub(entries: list) -> pd.DataFrame:
+    """Normalize Finnhub insider transaction entries, classified by Form 4 transaction code."""
+    data = pd.DataFrame(entries, columns=[
+        "transactionDate", "filingDate", "name", "transactionCode", "change", "transactionPrice",
+    ])
+    frame = pd.DataFrame(
+        {
+            "date": data["transactionDate"].fillna(data["filingDate"]),
+            "insider": data["name"].astype(str),
+            "kind": data["transactionCode"].map(_FINNHUB_KINDS).fillna(OTHER),
+            "shares": data["change"],
+            "price": data["transactionPrice"],
+            "value": np.nan,
+        }
+    )
+    return _finish(frame)
+
+
+def _settings():
+    config = get_config()
+    return (
+        sorted(config.get("insider_windows") or [30, 90, 180]),
+        config.get("insider_top_trades", 5),
+        config.get("insider_cluster_min_buyers", 3),
+    )
+
+
+def aggregate_insider_activity(
+    transactions: Annotated[pd.DataFrame, "normalized transactions (see TRANSACTION_COLUMNS)"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    windows: Annotated[Optional[list], "trailing windows in days; default config['insider_windows']"] = None,
+    cluster_min_buyers: Annotated[Optional[int], "distinct buyers that make a cluster buy"] = None,
+) -> pd.DataFrame:
+    """
+    Net shares and dollars bought (+) or sold (-), trade counts, distinct
+    buying and selling insiders and a cluster-buy flag for each trailing window
+    ending on curr_date. All windows are computed at once from a
+    transaction-by-window membership matrix.
+    """
+    default_windows, _, default_cluster = _settings()
+    windows = sorted(windows or default_windows)
+    cluster_min_buyers = cluster_min_buyers or default_cluster
+
+    as_of = pd.Timestamp(curr_date).normalize()
+    age = (as_of - transactions["date"]).dt.days.to_numpy()
+    # member[i, j]: transaction i falls in window j
+    member = (age[:, None] >= 0) & (age[:, None] < np.asarray(windows)[None, :])
+
+    kind = transactions["kind"].to_numpy()
+    is_buy, is_sell = kind == BUY, kind == SELL
+    insiders, codes = np.unique(transactions["insider"].to_numpy(dtype=str), return_inverse=True)
+
+    def distinct(mask):
+        # Distinct insiders per window: insider-by-window incidence, then count columns
+        seen = np.zeros((len(insiders), len(windows)), dtype=bool)
+        rows, cols = np.nonzero(mask)
+        seen[codes[rows], cols] = True
+        return seen.sum(axis=0)
+
+    buyers = distinct(member & is_buy[:, None])
+    summary = pd.DataFrame(
+        {
+            "buys": (member & is_buy[:, None]).sum(axis=0),
+            "sells": (member & is_sell[:, None]).sum(axis=0),
+            "net_shares": transactions["shares"].to_numpy() @ member,
+            "net_value": transactions["value"].to_numpy() @ member,
+            "buyers": buyers,
+            "sellers": distinct(member & is_sell[:, None]),
+            "other": (member & (kind == OTHER)[:, None]).sum(axis=0),
+            "cluster_buy": buyers >= cluster_min_buyers,
+        },
+        index=[f"{w}d" for w in windows],
+    )
+    summary.index.name = "window"
+    return summary
+
+
+def top_trades(
+    transactions: Annotated[pd.DataFrame, "normalized transactions (see TRANSACTION_COLUMNS)"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+    days: Annotated[int, "trailing window in days"],
+    n: Annotated[int, "number of trades"],
+) -> pd.DataFrame:
+    """The n largest open-market trades by dollar value in the trailing window."""
+    as_of = pd.Timestamp(curr_date).normalize()
+    age = (as_of - transactions["date"]).dt.days
+    trades = transactions[(age >= 0) & (age < days) & (transactions["kind"] != OTHER)]
+    return trades.loc[trades["value"].abs().nlargest(n).index]
+
+
+def insider_report(
+    ticker: Annotated[str, "ticker symbol"],
+    transactions: Annotated[pd.DataFrame, "normalized transactions (see TRANSACTION_COLUMNS)"],
+    curr_date: Annotated[Optional[str], "current date you are trading at, yyyy-mm-dd (None for today)"],
+    source: Annotated[str, "vendor the transactions came from"],
+) -> str:
+    """Insider activity features and the largest recent trades, as compact fixed-width tables."""
+    curr_date = curr_date or pd.Timestamp.now().strftime("%Y-%m-%d")
+    windows, n, cluster_min_buyers = _settings()
+    transactions = transactions[transactions["date"] <= pd.Timestamp(curr_date)]
+
+    summary = aggregate_insider_activity(transactions, curr_date, windows, cluster_min_buyers)
+    summary["net_shares"] = summary["net_shares"].map(lambda v: f"{v:+,.0f}")
+    summary["net_value"] = summary["net_value"].map(lambda v: f"{v:+,.0f}")
+    summary["cluster_buy"] = summary["cluster_buy"].map({True: "yes", False: "no"})
+
+    trades = top_trades(transactions, curr_date, windows[-1], n)
+    trades = pd.DataFrame(
+        {
+            "date": trades["date"].dt.strftime("%Y-%m-%d"),
+            "insider": trades["insider"].str.slice(0, 28),
+            "kind": trades["kind"],
+            "shares": trades["shares"].map(lambda v: f"{v:+,.0f}"),
+            "price": trades["price"].map(lambda v: f"{v:,.2f}" if pd.notna(v) else "-"),
+            "value": trades["value"].map(lambda v: f"{v:+,.0f}"),
+        }
+    )
+
+    text = (
+        f"## {ticker.upper()} insider activity as of {curr_date} (source: {source})\n"
+        f"# Open-market trades only: net_shares/net_value are buys (+) minus sells (-) in USD; "
+        f"buyers/sellers count distinct insiders; other = awards, gifts, exercises; "
+        f"cluster_buy = {cluster_min_buyers}+ distinct buyers in the window\n"
+        + summary.to_string()
+        + f"\n\n### Largest trades in the last {windows[-1]} days\n"
+    )
+    if trades.empty:
+        return text + "No open-market trades.\n"
+    return text + trades.to_string(index=False) + "\n"
@@ -1,4 +1,6 @@
-from typing import Annotated
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, wait, FIRST_COMPLETED
 
 # Import from vendor-specific modules
 from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
@@ -19,6 +21,10 @@ from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
 from .config import get_config
+from .vendor_health import get_vendor_health
+from .telemetry import emit, payload_size
+from .result_cache import cached_result
+from .cassette import cassette_call, replay_mode, CassetteMissError, OFF
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -138,7 +144,150 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
+_executor = None
+_executor_lock = threading.Lock()
+# Timed-out calls still running on the current pool's workers
+_abandoned = set()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Shared pool for concurrent vendor calls, sized by config["vendor_max_workers"]."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_config().get("vendor_max_workers", 8),
+                thread_name_prefix="vendor",
+            )
+        return _executor
+
+
+def _abandon(method, future) -> None:
+    """
+    Give up on a timed-out call. A call that already started cannot be cancelled
+    and keeps its worker; once half the workers are held this way, later calls
+    get a fresh pool and the old one is left to drain.
+    """
+    global _executor
+    if future.cancel():
+        return
+    with _executor_lock:
+        _abandoned.add(future)
+        future.add_done_callback(_abandoned.discard)
+        max_workers = get_config().get("vendor_max_workers", 8)
+        if _executor is None or len(_abandoned) < max(1, max_workers // 2):
+            return
+        stuck = len(_abandoned)
+        _executor.shutdown(wait=False)
+        _executor = None
+        _abandoned.clear()
+    emit("vendor.pool_replaced", "warning", method=method, abandoned=stuck)
+
+
+def _timed_call(method, vendor, impl_func, args, kwargs):
+    """Run one implementation (through the cassette store); returns (ok, result or exception, seconds elapsed)."""
+    start = time.monotonic()
+    try:
+        result = cassette_call(method, vendor, impl_func, args, kwargs)
+        return True, result, time.monotonic() - start
+    except Exception as e:
+        return False, e, time.monotonic() - start
+
+
+def _run_calls(method, calls, args, kwargs):
+    """
+    Run vendor implementations and return (ok, result or exception, seconds) per call, in call order.
+    Calls run concurrently on the shared pool, even a lone one, each bounded by
+    config["vendor_call_timeout"] seconds, so latency is that of the slowest call.
+    Every outcome is recorded in the vendor health stats.
+    """
+    health = get_vendor_health()
+    timeout = get_config().get("vendor_call_timeout")
+    start = time.monotonic()
+    deadline = None if timeout is None else start + timeout
+    executor = _get_executor()
+    futures = [
+        executor.submit(_timed_call, method, vendor_name, impl_func, args, kwargs)
+        for impl_func, vendor_name in calls
+    ]
+
+    outcomes = []
+    for future, (_, vendor_name) in zip(futures, calls):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            ok, outcome, elapsed = future.result(timeout=remaining)
+        except FuturesTimeoutError as e:
+            # The call keeps running in its worker; its result is discarded
+            _abandon(method, future)
+            ok, outcome, elapsed = False, e, time.monotonic() - start
+        health.record(vendor_name, method, elapsed, ok)
+        outcomes.append((ok, outcome, elapsed))
+    return outcomes
+
+
+def _run_hedged(method, call, hedge_call, delay, args, kwargs):
+    """
+    Run call, and if it has not finished after delay seconds (its p95 latency), also
+    start hedge_call. Returns [(call, ok, outcome, seconds)]: the first success, or every failure.
+    """
+    health = get_vendor_health()
+    executor = _get_executor()
+    impl_func, vendor_name = call
+    start = time.monotonic()
+    timeout = get_config().get("vendor_call_timeout")
+    deadline = None if timeout is None else start + timeout
+
+    pending = {executor.submit(_timed_call, method, vendor_name, impl_func, args, kwargs): call}
+    done, _ = wait(pending, timeout=delay)
+    if not done:
+        hedge_impl, hedge_vendor = hedge_call
+        emit("vendor.hedge", "info", method=method, vendor=vendor_name, hedge_vendor=hedge_vendor, delay=round(delay, 3))
+        pending[executor.submit(_timed_call, method, hedge_vendor, hedge_impl, args, kwargs)] = hedge_call
+
+    failures = []
+    while pending:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for future in done:
+            finished = pending.pop(future)
+            ok, outcome, elapsed = future.result()
+            health.record(finished[1], method, elapsed, ok)
+            if ok:
+                # The slower call keeps running in its worker; only its stats are kept
+                for other, (_, other_vendor) in pending.items():
+                    other.add_done_callback(
+                        lambda f, v=other_vendor: health.record(v, method, f.result()[2], f.result()[0])
+                        if not f.cancelled() else None
+                    )
+                return [(finished, True, outcome, elapsed)]
+            failures.append((finished, False, outcome, elapsed))
+
+    for future, unfinished in pending.items():
+        _abandon(method, future)
+        health.record(unfinished[1], method, time.monotonic() - start, False)
+        failures.append((unfinished, False, FuturesTimeoutError(), time.monotonic() - start))
+    return failures
+
+
 def route_to_vendor(method: str, *args, **kwargs):
+    """
+    Route method calls to appropriate vendor implementation with fallback support.
+    Results are shared through the cross-process result cache, and identical
+    concurrent calls wait on the first one.
+    """
+    vendor_config = get_vendor(get_category_for_method(method), method)
+    if replay_mode() != OFF:
+        # Recording and replay must see every vendor call, not shared results
+        return _route_to_vendor(method, *args, **kwargs)
+    return cached_result(
+        method, vendor_config, args, kwargs,
+        lambda: _route_to_vendor(method, *args, **kwargs),
+    )
+
+
+def _route_to_vendor(method: str, *args, **kwargs):
     """Route method calls to appropriate vendor implementation with fallback support."""
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
@@ -158,83 +307,142 @@ def route_to_vendor(method: str, *args, **kwargs):
         if vendor not in fallback_vendors:
             fallback_vendors.append(vendor)
 
-    # Debug: Print fallback ordering
-    primary_str = " → ".join(primary_vendors)
-    fallback_str = " → ".join(fallback_vendors)
-    print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
+    # Vendors beyond the configured ones are tried healthiest and fastest first
+    health = get_vendor_health()
+    fallback_vendors = primary_vendors + health.rank(fallback_vendors[len(primary_vendors):], method)
+
+    route_start = time.monotonic()
+    emit("route.start", "debug", method=method, primary=primary_vendors, fallback_order=fallback_vendors)
 
     # Track results and execution state
     results = []
     vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
+    vendor_attempt = {}
     successful_vendor = None
 
+    runnable_vendors = []
     for vendor in fallback_vendors:
         if vendor not in VENDOR_METHODS[method]:
             if vendor in primary_vendors:
-                print(f"INFO: Vendor '{vendor}' not supported for method '{method}', falling back to next vendor")
+                emit("vendor.unsupported", "info", method=method, vendor=vendor)
             continue
+        runnable_vendors.append(vendor)
 
-        vendor_impl = VENDOR_METHODS[method][vendor]
-        is_primary_vendor = vendor in primary_vendors
-        vendor_attempt_count += 1
+    # Vendors with an open circuit are skipped, unless that would leave nothing to try
+    ignore_breakers = all(health.is_open(vendor, method) for vendor in runnable_vendors)
+    hedging = get_config().get("vendor_hedging", False)
 
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
-
-        # Debug: Print current attempt
-        vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
-        print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
+    # Multiple vendor configs (comma-separated) collect from every vendor, so all of
+    # them run at once; single-vendor configs try one vendor at a time in order
+    if len(primary_vendors) > 1:
+        batches = [runnable_vendors]
+    else:
+        batches = [[vendor] for vendor in runnable_vendors]
 
-        # Handle list of methods for a vendor
+    def impl_calls(vendor):
+        vendor_impl = VENDOR_METHODS[method][vendor]
         if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
-        else:
-            vendor_methods = [(vendor_impl, vendor)]
-
-        # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
+            return [(impl, vendor) for impl in vendor_impl]
+        return [(vendor_impl, vendor)]
+
+    attempted_vendors = set()
+    for batch_index, batch in enumerate(batches):
+        attempted = []
+        calls = []
+        for vendor in batch:
+            if vendor in attempted_vendors:
                 continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
+            if not ignore_breakers and not health.allow(vendor, method):
+                emit("vendor.skipped", "info", method=method, vendor=vendor, reason="circuit_open")
                 continue
+            is_primary_vendor = vendor in primary_vendors
+            vendor_attempt_count += 1
+            vendor_attempt[vendor] = vendor_attempt_count
+            attempted.append(vendor)
+
+            emit(
+                "vendor.attempt", "debug", method=method, vendor=vendor,
+                attempt=vendor_attempt_count, primary=is_primary_vendor,
+                implementations=len(impl_calls(vendor)),
+            )
+            calls.extend(impl_calls(vendor))
+        attempted_vendors.update(attempted)
+        if not calls:
+            continue
 
-        # Add this vendor's results
-        if vendor_results:
-            results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-            
-            # Stopping logic: Stop after first successful vendor for single-vendor configs
-            # Multiple vendor configs (comma-separated) may want to collect from multiple sources
-            if len(primary_vendors) == 1:
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' (single-vendor config)")
-                break
+        # Hedge a lone call that runs past its p95 latency with the next vendor in line
+        hedge_vendor, delay = None, None
+        if hedging and len(calls) == 1 and len(primary_vendors) == 1:
+            delay = health.latency_quantile(attempted[0], method, 0.95)
+        if delay is not None:
+            for later in batches[batch_index + 1:]:
+                if (
+                    later[0] not in attempted_vendors
+                    and len(impl_calls(later[0])) == 1
+                    and (ignore_breakers or not health.is_open(later[0], method))
+                ):
+                    hedge_vendor = later[0]
+                    break
+        if hedge_vendor is not None:
+            outcomes = _run_hedged(method, calls[0], impl_calls(hedge_vendor)[0], delay, args, kwargs)
+            if any(finished[1] == hedge_vendor for finished, _, _, _ in outcomes):
+                vendor_attempt_count += 1
+                vendor_attempt[hedge_vendor] = vendor_attempt_count
+                attempted.append(hedge_vendor)
+                attempted_vendors.add(hedge_vendor)
+            calls = [finished for finished, _, _, _ in outcomes]
+            outcomes = [(ok, outcome, elapsed) for _, ok, outcome, elapsed in outcomes]
         else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
+            outcomes = _run_calls(method, calls, args, kwargs)
+
+        # Outcomes come back in call order
+        vendor_results = {vendor: [] for vendor in attempted}
+        for (impl_func, vendor_name), (ok, outcome, elapsed) in zip(calls, outcomes):
+            event = {
+                "method": method,
+                "vendor": vendor_name,
+                "impl": impl_func.__name__,
+                "attempt": vendor_attempt[vendor_name],
+                "latency": round(elapsed, 4),
+            }
+            if isinstance(outcome, CassetteMissError):
+                # Strict offline mode: a missing recording is an error, not a vendor failure
+                emit("vendor.call", "error", outcome="cassette_miss", error=str(outcome), **event)
+                raise outcome
+            if ok:
+                vendor_results[vendor_name].append(outcome)
+                emit("vendor.call", "debug", outcome="ok", bytes=payload_size(outcome), **event)
+            elif isinstance(outcome, AlphaVantageRateLimitError):
+                emit("vendor.call", "warning", outcome="rate_limited", error=str(outcome), **event)
+            elif isinstance(outcome, FuturesTimeoutError):
+                emit("vendor.call", "warning", outcome="timeout", **event)
+            else:
+                # Log error but continue with other implementations
+                emit("vendor.call", "warning", outcome="error", error=f"{type(outcome).__name__}: {outcome}", **event)
+
+        # Add each vendor's results
+        for vendor in attempted:
+            if vendor_results[vendor]:
+                results.extend(vendor_results[vendor])
+                successful_vendor = vendor
+                emit("vendor.result", "debug", method=method, vendor=vendor, outcome="ok", results=len(vendor_results[vendor]))
+            else:
+                emit("vendor.result", "info", method=method, vendor=vendor, outcome="no_results")
+
+        # Stopping logic: Stop after first successful vendor for single-vendor configs
+        if successful_vendor is not None and len(primary_vendors) == 1:
+            break
 
     # Final result summary
+    latency = round(time.monotonic() - route_start, 4)
     if not results:
-        print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
+        emit("route.end", "error", method=method, outcome="failed", attempts=vendor_attempt_count, latency=latency)
         raise RuntimeError(f"All vendor implementations failed for method '{method}'")
     else:
-        print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
+        emit(
+            "route.end", "info", method=method, outcome="ok", vendor=successful_vendor,
+            results=len(results), attempts=vendor_attempt_count, latency=latency,
+        )
 
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
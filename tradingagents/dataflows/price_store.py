@@ -0,0 +1,346 @@
+import os
+import json
+import tempfile
+from typing import Annotated, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .hot_cache import get_hot_cache, file_version
+from .telemetry import emit
+
+# Columns persisted for every symbol, in on-disk order
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Depth of history seeded for a symbol the first time it is requested
+HISTORY_YEARS = 15
+
+# Relative tolerance when comparing the re-downloaded overlap bar to the stored one.
+# Auto-adjusted prices shift after dividends/splits; a mismatch means history changed.
+OVERLAP_RTOL = 1e-4
+
+
+def _store_dir() -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "price_store")
+
+
+def _store_path(symbol: str) -> str:
+    return os.path.join(_store_dir(), f"{symbol.upper()}.npz")
+
+
+def read_store(path: str):
+    """
+    Read a column store file.
+    Returns (frame, meta); frame is None when the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None, {}
+
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(str(npz["__meta__"]))
+        columns = {"Date": npz["Date"].astype("datetime64[D]").astype("datetime64[ns]")}
+        for name in npz.files:
+            if name not in ("__meta__", "Date"):
+                columns[name] = npz[name]
+
+    return pd.DataFrame(columns), meta
+
+
+def write_store(path: str, frame: pd.DataFrame, meta: dict) -> None:
+    """
+    Atomically write a column store file: the frame is saved to a temporary file
+    in the same directory and renamed over the target, so readers never observe
+    a partially written store.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    arrays = {
+        "__meta__": np.array(json.dumps(meta)),
+        "Date": frame["Date"].to_numpy(dtype="datetime64[D]").astype(np.int64),
+    }
+    for col in frame.columns:
+        if col != "Date":
+            arrays[col] = frame[col].to_numpy(dtype=np.float64)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _download(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Download daily auto-adjusted bars in [start, end) from Yahoo Finance."""
+    data = yf.download(
+        symbol.upper(),
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        multi_level_index=False,
+        progress=False,
+        auto_adjust=True,
+    )
+    return _normalize_download(data)
+
+
+def _normalize_download(data: pd.DataFrame) -> pd.DataFrame:
+    if data is None or data.empty:
+        return pd.DataFrame(columns=["Date"] + PRICE_COLUMNS)
+
+    data = data.reset_index()
+    data = data.rename(columns={data.columns[0]: "Date"})
+    data["Date"] = pd.to_datetime(data["Date"])
+    if data["Date"].dt.tz is not None:
+        data["Date"] = data["Date"].dt.tz_localize(None)
+    data["Date"] = data["Date"].dt.normalize()
+
+    data = data[["Date"] + PRICE_COLUMNS].dropna(subset=["Close"])
+    return data.sort_values("Date").drop_duplicates("Date", keep="last").reset_index(drop=True)
+
+
+def _history_changed(stored: pd.DataFrame, delta: pd.DataFrame) -> bool:
+    """Check whether the overlapping bar of a delta download disagrees with the store."""
+    last_date = stored["Date"].iloc[-1]
+    overlap = delta[delta["Date"] == last_date]
+    if overlap.empty:
+        return False
+    return not np.isclose(
+        overlap["Close"].iloc[0], stored["Close"].iloc[-1], rtol=OVERLAP_RTOL
+    )
+
+
+def sync_price_history(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[Optional[str], "earliest date that must be covered, yyyy-mm-dd"] = None,
+):
+    """
+    Bring the local price store for a symbol up to date and return (frame, meta).
+
+    The first call seeds HISTORY_YEARS of daily bars. Later calls only download the
+    tail since the last stored bar (at most once per calendar day). The tail request
+    re-fetches the last stored bar; if its adjusted close no longer matches, a split
+    or dividend re-adjusted history and the store is rebuilt from scratch.
+    """
+    path = _store_path(symbol)
+    today = pd.Timestamp.today().normalize()
+    seed_start = today - pd.DateOffset(years=HISTORY_YEARS)
+    if start_date is not None:
+        seed_start = min(seed_start, pd.Timestamp(start_date))
+
+    # Hot path: the parsed store is already in memory and was synced today
+    cache = get_hot_cache()
+    version = file_version(path)
+    cached = cache.get(("price_store", path, version)) if version else None
+    if cached is not None:
+        frame, meta = cached
+        if (
+            meta.get("checked_on") == today.strftime("%Y-%m-%d")
+            and pd.Timestamp(meta["seed_start"]) <= seed_start
+        ):
+            return frame, meta
+
+    frame, meta = read_store(path)
+
+    if frame is None or frame.empty:
+        frame = _download(symbol, seed_start, today)
+        meta = {
+            "symbol": symbol.upper(),
+            "seed_start": seed_start.strftime("%Y-%m-%d"),
+            "revision": meta.get("revision", 0) + 1,
+        }
+    else:
+        stored_seed = pd.Timestamp(meta["seed_start"])
+        if seed_start < stored_seed:
+            # Extend the head of the series for requests reaching further back
+            head = _download(symbol, seed_start, frame["Date"].iloc[0])
+            frame = pd.concat([head, frame], ignore_index=True)
+            meta["seed_start"] = seed_start.strftime("%Y-%m-%d")
+            meta["checked_on"] = None
+
+        if meta.get("checked_on") == today.strftime("%Y-%m-%d"):
+            cache.put(("price_store", path, version), (frame, meta))
+            return frame, meta
+
+        delta = _download(symbol, frame["Date"].iloc[-1], today)
+        if _history_changed(frame, delta):
+            frame = _download(symbol, pd.Timestamp(meta["seed_start"]), today)
+            meta["revision"] = meta.get("revision", 0) + 1
+        else:
+            delta = delta[delta["Date"] > frame["Date"].iloc[-1]]
+            if not delta.empty:
+                frame = pd.concat([frame, delta], ignore_index=True)
+
+    meta["checked_on"] = today.strftime("%Y-%m-%d")
+    write_store(path, frame, meta)
+    cache.put(("price_store", path, file_version(path)), (frame, meta))
+    return frame, meta
+
+
+def _download_many(symbols: list, start: pd.Timestamp, end: pd.Timestamp) -> dict:
+    """
+    Download daily auto-adjusted bars in [start, end) for several symbols in one request.
+    Returns {symbol: normalized frame}; symbols without data map to empty frames.
+    A frame without per-ticker columns is only attributed to a single requested symbol.
+    """
+    data = yf.download(
+        symbols,
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        group_by="ticker",
+        progress=False,
+        auto_adjust=True,
+        threads=True,
+    )
+    frames = {}
+    for symbol in symbols:
+        if data is None or data.empty:
+            frames[symbol] = _normalize_download(None)
+        elif isinstance(data.columns, pd.MultiIndex):
+            if symbol in data.columns.get_level_values(0):
+                frames[symbol] = _normalize_download(data[symbol])
+            else:
+                frames[symbol] = _normalize_download(None)
+        elif len(symbols) == 1:
+            frames[symbol] = _normalize_download(data)
+        else:
+            # Flat columns for a multi-symbol request: the bars cannot be told apart
+            frames[symbol] = _normalize_download(None)
+    return frames
+
+
+def _download_errors() -> dict:
+    """Per-symbol error messages yfinance recorded for its last download, if exposed."""
+    try:
+        return dict(yf.shared._ERRORS)
+    except AttributeError:
+        return {}
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def prefetch_price_histories(
+    symbols: Annotated[list, "ticker symbols to warm up"],
+    start_date: Annotated[Optional[str], "earliest date that must be covered, yyyy-mm-dd"] = None,
+    chunk_size: Annotated[Optional[int], "symbols per download request"] = None,
+) -> dict:
+    """
+    Bring the price stores of a whole universe up to date with batched downloads.
+
+    Symbols are grouped into multi-ticker requests of chunk_size (default
+    config["price_prefetch_chunk_size"]): one set for tail updates since the
+    earliest stored bar in the chunk, one for symbols that need a full seed.
+    Each result is split per symbol into the same stores sync_price_history
+    maintains, with the same re-adjustment check. Returns a report:
+    {"fresh": [...], "updated": [...], "seeded": [...], "failed": {symbol: reason}}.
+    """
+    chunk_size = chunk_size or get_config().get("price_prefetch_chunk_size", 100)
+    today = pd.Timestamp.today().normalize()
+    today_str = today.strftime("%Y-%m-%d")
+    seed_start = today - pd.DateOffset(years=HISTORY_YEARS)
+    if start_date is not None:
+        seed_start = min(seed_start, pd.Timestamp(start_date))
+
+    report = {"fresh": [], "updated": [], "seeded": [], "failed": {}}
+    cache = get_hot_cache()
+
+    def commit(symbol, frame, meta):
+        path = _store_path(symbol)
+        meta["checked_on"] = today_str
+        write_store(path, frame, meta)
+        cache.put(("price_store", path, file_version(path)), (frame, meta))
+
+    # Sort symbols into already-synced, tail updates and full seeds
+    seeds = {}
+    updates = {}
+    for symbol in dict.fromkeys(s.upper() for s in symbols):
+        frame, meta = read_store(_store_path(symbol))
+        if frame is None or frame.empty or pd.Timestamp(meta["seed_start"]) > seed_start:
+            seeds[symbol] = meta
+        elif meta.get("checked_on") == today_str:
+            report["fresh"].append(symbol)
+        else:
+            updates[symbol] = (frame, meta)
+
+    for chunk in _chunks(list(updates), chunk_size):
+        start = min(updates[symbol][0]["Date"].iloc[-1] for symbol in chunk)
+        try:
+            deltas = _download_many(chunk, start, today)
+        except Exception as e:
+            report["failed"].update({symbol: str(e) for symbol in chunk})
+            continue
+        errors = _download_errors()
+        for symbol in chunk:
+            frame, meta = updates[symbol]
+            delta = deltas[symbol]
+            if delta.empty:
+                # The request reaches back to the last stored bar, so some data was due
+                report["failed"][symbol] = errors.get(symbol, "no data returned")
+                continue
+            if _history_changed(frame, delta):
+                seeds[symbol] = meta
+                continue
+            delta = delta[delta["Date"] > frame["Date"].iloc[-1]]
+            if not delta.empty:
+                frame = pd.concat([frame, delta], ignore_index=True)
+            commit(symbol, frame, meta)
+            report["updated"].append(symbol)
+
+    for chunk in _chunks(list(seeds), chunk_size):
+        try:
+            frames = _download_many(chunk, seed_start, today)
+        except Exception as e:
+            report["failed"].update({symbol: str(e) for symbol in chunk})
+            continue
+        errors = _download_errors()
+        for symbol in chunk:
+            if frames[symbol].empty:
+                report["failed"][symbol] = errors.get(symbol, "no data returned")
+                continue
+            meta = {
+                "symbol": symbol,
+                "seed_start": seed_start.strftime("%Y-%m-%d"),
+                "revision": seeds[symbol].get("revision", 0) + 1,
+            }
+            commit(symbol, frames[symbol], meta)
+            report["seeded"].append(symbol)
+
+    emit(
+        "price_store.prefetch", "warning" if report["failed"] else "info",
+        seeded=len(report["seeded"]), updated=len(report["updated"]),
+        fresh=len(report["fresh"]), failed=sorted(report["failed"]),
+    )
+    return report
+
+
+def get_price_version(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> Optional[tuple]:
+    """Data version of a symbol's price store, for keying derived caches."""
+    return file_version(_store_path(symbol))
+
+
+def get_price_history(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[Optional[str], "Start date in yyyy-mm-dd format (inclusive)"] = None,
+    end_date: Annotated[Optional[str], "End date in yyyy-mm-dd format (exclusive)"] = None,
+) -> pd.DataFrame:
+    """
+    Return daily OHLCV bars for a symbol from the local price store, syncing it first.
+    The result has a datetime "Date" column followed by PRICE_COLUMNS.
+    """
+    frame, _ = sync_price_history(symbol, start_date)
+
+    dates = frame["Date"].to_numpy()
+    lo = 0 if start_date is None else np.searchsorted(dates, np.datetime64(start_date), "left")
+    hi = len(dates) if end_date is None else np.searchsorted(dates, np.datetime64(end_date), "left")
+    return frame.iloc[lo:hi].reset_index(drop=True)
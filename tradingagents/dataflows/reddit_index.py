@@ -0,0 +1,202 @@
+import os
+import json
+import hashlib
+import heapq
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Annotated, Callable, Optional
+
+from .config import get_config
+from .alias_matcher import AliasMatcher, get_alias_matcher, alias_version
+
+
+def _index_dir(category: str) -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "reddit_index", category)
+
+
+def _partition_path(index_dir: str, date: str, subreddit: str) -> str:
+    return os.path.join(index_dir, date, f"{subreddit}.jsonl")
+
+
+def _atomic_write(path: str, payload: bytes) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _read_partition(path: str) -> list:
+    try:
+        with open(path, "rb") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _post_key(post: dict):
+    return post.get("id") or (post["title"], post["url"], post["created_utc"])
+
+
+def _to_post(parsed_line: dict, matcher: AliasMatcher) -> dict:
+    return {
+        "id": parsed_line.get("id"),
+        "created_utc": parsed_line["created_utc"],
+        "title": parsed_line["title"],
+        "content": parsed_line["selftext"],
+        "url": parsed_line["url"],
+        "upvotes": parsed_line["ups"],
+        "posted_date": datetime.utcfromtimestamp(parsed_line["created_utc"]).strftime("%Y-%m-%d"),
+        # Tickers mentioned in the title or body, tagged once at ingest
+        "tickers": sorted(
+            matcher.match(parsed_line["title"] + "\n" + parsed_line["selftext"])
+        ),
+    }
+
+
+def _merge_into_partitions(index_dir: str, subreddit: str, posts_by_date: dict) -> None:
+    """Merge new posts into their (date, subreddit) partitions, kept sorted by upvotes."""
+    for date, new_posts in posts_by_date.items():
+        path = _partition_path(index_dir, date, subreddit)
+        posts = _read_partition(path)
+        seen = {_post_key(p) for p in posts}
+        for post in new_posts:
+            key = _post_key(post)
+            if key not in seen:
+                seen.add(key)
+                posts.append(post)
+        # Stable sort: ties keep their order in the source file
+        posts.sort(key=lambda x: x["upvotes"], reverse=True)
+        _atomic_write(path, b"".join(json.dumps(p).encode() + b"\n" for p in posts))
+
+
+def _drop_subreddit(index_dir: str, subreddit: str) -> None:
+    """Remove every partition of a subreddit, before re-ingesting a rewritten source file."""
+    if not os.path.isdir(index_dir):
+        return
+    for date in os.listdir(index_dir):
+        path = _partition_path(index_dir, date, subreddit)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def ensure_reddit_index(
+    data_path: Annotated[str, "Path to the reddit data folder"],
+    category: Annotated[str, "Category (folder of subreddit .jsonl files)"],
+) -> str:
+    """
+    Partition a category's subreddit JSONL files by UTC date and subreddit, tagging
+    each post with the tickers it mentions.
+
+    Ingest is incremental: the manifest records how many bytes of each source file
+    were consumed, with the file's mtime and a hash of those bytes, so appended
+    lines are the only ones parsed on the next call. A source file whose consumed
+    bytes changed (rewritten or re-crawled, whatever its size) is re-ingested from
+    the start. Returns the index directory.
+    """
+    source_dir = os.path.join(data_path, category)
+    index_dir = _index_dir(category)
+    manifest_path = os.path.join(index_dir, "manifest.json")
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+    aliases = alias_version()
+    if (
+        manifest.get("source_dir") != os.path.abspath(source_dir)
+        or manifest.get("alias_version") != aliases
+    ):
+        # Index built from a different data folder or alias list: start over
+        shutil.rmtree(index_dir, ignore_errors=True)
+        manifest = {
+            "source_dir": os.path.abspath(source_dir),
+            "alias_version": aliases,
+            "files": {},
+        }
+    matcher = get_alias_matcher()
+
+    changed = False
+    for data_file in sorted(os.listdir(source_dir)):
+        if not data_file.endswith(".jsonl"):
+            continue
+        subreddit = data_file[: -len(".jsonl")]
+        source = os.path.join(source_dir, data_file)
+        stat = os.stat(source)
+        entry = manifest["files"].get(data_file)
+        if not isinstance(entry, dict):
+            # Not ingested yet, or recorded by an older manifest without a hash
+            if entry is not None:
+                _drop_subreddit(index_dir, subreddit)
+            entry = None
+        elif stat.st_size == entry["offset"] and stat.st_mtime_ns == entry["mtime_ns"]:
+            continue
+
+        posts_by_date = {}
+        with open(source, "rb") as f:
+            digest = hashlib.sha1()
+            offset = 0
+            if entry is not None:
+                # Check that the bytes ingested so far are unchanged before resuming
+                remaining = entry["offset"]
+                while remaining:
+                    chunk = f.read(min(remaining, 1 << 20))
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    remaining -= len(chunk)
+                if not remaining and digest.hexdigest() == entry["prefix_hash"]:
+                    offset = entry["offset"]
+                else:
+                    _drop_subreddit(index_dir, subreddit)
+                    f.seek(0)
+                    digest = hashlib.sha1()
+            for line in f:
+                if not line.strip():
+                    offset += len(line)
+                    digest.update(line)
+                    continue
+                try:
+                    parsed_line = json.loads(line)
+                except ValueError:
+                    if line.endswith(b"\n"):
+                        raise
+                    # Partially written last line; pick it up on the next ingest
+                    break
+                offset += len(line)
+                digest.update(line)
+                post = _to_post(parsed_line, matcher)
+                posts_by_date.setdefault(post["posted_date"], []).append(post)
+
+        _merge_into_partitions(index_dir, subreddit, posts_by_date)
+        manifest["files"][data_file] = {
+            "offset": offset,
+            "mtime_ns": stat.st_mtime_ns,
+            "prefix_hash": digest.hexdigest(),
+        }
+        changed = True
+
+    if changed:
+        _atomic_write(manifest_path, json.dumps(manifest).encode())
+    return index_dir
+
+
+def top_posts(
+    index_dir: Annotated[str, "index directory returned by ensure_reddit_index"],
+    date: Annotated[str, "UTC date, yyyy-mm-dd"],
+    subreddit: Annotated[str, "subreddit name (source file name without .jsonl)"],
+    k: Annotated[int, "number of posts to return"],
+    predicate: Optional[Callable[[dict], bool]] = None,
+) -> list:
+    """Return the k most upvoted posts of one (date, subreddit) partition matching predicate."""
+    posts = _read_partition(_partition_path(index_dir, date, subreddit))
+    if predicate is not None:
+        posts = [p for p in posts if predicate(p)]
+    top = heapq.nlargest(k, posts, key=lambda x: x["upvotes"])
+    return [
+        {key: post[key] for key in ("title", "content", "url", "upvotes", "posted_date")}
+        for post in top
+    ]
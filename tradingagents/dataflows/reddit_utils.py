@@ -1,53 +1,7 @@
-import requests
-import time
-import json
-from datetime import datetime, timedelta
-from contextlib import contextmanager
 from typing import Annotated
 import os
-import re
-
-ticker_to_company = {
-    "AAPL": "Apple",
-    "MSFT": "Microsoft",
-    "GOOGL": "Google",
-    "AMZN": "Amazon",
-    "TSLA": "Tesla",
-    "NVDA": "Nvidia",
-    "TSM": "Taiwan Semiconductor Manufacturing Company OR TSMC",
-    "JPM": "JPMorgan Chase OR JP Morgan",
-    "JNJ": "Johnson & Johnson OR JNJ",
-    "V": "Visa",
-    "WMT": "Walmart",
-    "META": "Meta OR Facebook",
-    "AMD": "AMD",
-    "INTC": "Intel",
-    "QCOM": "Qualcomm",
-    "BABA": "Alibaba",
-    "ADBE": "Adobe",
-    "NFLX": "Netflix",
-    "CRM": "Salesforce",
-    "PYPL": "PayPal",
-    "PLTR": "Palantir",
-    "MU": "Micron",
-    "SQ": "Block OR Square",
-    "ZM": "Zoom",
-    "CSCO": "Cisco",
-    "SHOP": "Shopify",
-    "ORCL": "Oracle",
-    "X": "Twitter OR X",
-    "SPOT": "Spotify",
-    "AVGO": "Broadcom",
-    "ASML": "ASML ",
-    "TWLO": "Twilio",
-    "SNAP": "Snap Inc.",
-    "TEAM": "Atlassian",
-    "SQSP": "Squarespace",
-    "UBER": "Uber",
-    "ROKU": "Roku",
-    "PINS": "Pinterest",
-}
-
+from .reddit_index import ensure_reddit_index, top_posts
+from .alias_matcher import AliasMatcher, get_alias_matcher
 
 def fetch_top_from_category(
     category: Annotated[
@@ -74,62 +28,39 @@ def fetch_top_from_category(
         os.listdir(os.path.join(base_path, category))
     )
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
-
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
+    # Posts are served from the date/subreddit partitions, ingested incrementally
+    index_dir = ensure_reddit_index(base_path, category)
 
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
+    predicate = None
+    # if is company_news, keep posts whose title or content mentions the company (query)
+    if "company" in category and query:
+        if query in get_alias_matcher().tickers:
+            # Posts were tagged with every ticker they mention during ingest
+            def tagged(post):
+                return query in post["tickers"]
 
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
+            predicate = tagged
+        else:
+            matcher = AliasMatcher({query: []})
 
-                    search_terms.append(query)
+            def mentioned(post):
+                return matcher.mentions(post["title"] + "\n" + post["content"], query)
 
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
+            predicate = mentioned
 
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
-
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    for data_file in os.listdir(os.path.join(base_path, category)):
+        # check if data_file is a .jsonl file
+        if not data_file.endswith(".jsonl"):
+            continue
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+        all_content.extend(
+            top_posts(
+                index_dir,
+                date,
+                data_file[: -len(".jsonl")],
+                limit_per_subreddit,
+                predicate,
+            )
+        )
 
     return all_content
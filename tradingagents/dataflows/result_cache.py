@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from typing import Annotated, Callable
+
+from .config import get_config
+from .utils import connect_sqlite
+from .telemetry import emit
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        method TEXT NOT NULL,
+        vendor TEXT NOT NULL,
+        value TEXT NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS inflight (
+        key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        started_at REAL NOT NULL
+    )
+    """,
+)
+
+# How often a process waiting on another process's in-flight call checks for its result
+_POLL_INTERVAL = 0.1
+
+# Tool outputs that report a failure or an empty result rather than data. These
+# are returned instead of raised by the vendors, and must not outlive the call.
+_NOT_CACHED = re.compile(r"(Error\b|None$|No .{0,80}\bfound\b)")
+
+# Keys of Alpha Vantage JSON payloads that carry an error or quota notice
+_NOTICE_KEYS = ('"Error Message"', '"Information"', '"Note"')
+
+# Config entries that change how a routed result is formatted; they are part of the key
+# so a config change never serves results in the old format
+_OUTPUT_CONFIG_KEYS = (
+    "alpha_vantage_indicator_mode",
+    "fundamentals_publish_lag_days",
+    "fundamentals_view",
+    "fundamentals_view_periods",
+    "fundamentals_line_items",
+    "insider_windows",
+    "insider_top_trades",
+    "insider_cluster_min_buyers",
+)
+
+_local = threading.local()
+_lock = threading.Lock()
+# In-process single flight: key -> Event set when the leading thread finishes
+_inflight = {}
+
+
+def _cache_path() -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "result_cache.sqlite")
+
+
+def _connection():
+    path = _cache_path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != path:
+        conn = connect_sqlite(path)
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        _local.conn, _local.path = conn, path
+    return conn
+
+
+def result_key(method: str, vendor: str, args: tuple, kwargs: dict) -> str:
+    """
+    Content address of a routed call: hash of method, vendor config, normalized
+    arguments and the config entries that shape the output.
+    """
+    def normalize(value):
+        return value.strip() if isinstance(value, str) else value
+
+    config = get_config()
+    payload = json.dumps(
+        [
+            method,
+            vendor.replace(" ", ""),
+            [normalize(a) for a in args],
+            sorted((k, normalize(v)) for k, v in kwargs.items()),
+            [config.get(name) for name in _OUTPUT_CONFIG_KEYS],
+        ],
+        default=str,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _ttl(method: str) -> float:
+    config = get_config()
+    return (config.get("result_cache_ttls") or {}).get(method, config.get("result_cache_ttl", 0))
+
+
+def _cacheable(value) -> bool:
+    """Only non-empty string results that are not error or notice messages are stored."""
+    if not isinstance(value, str):
+        return False
+    text = value.strip()
+    if not text or _NOT_CACHED.match(text):
+        return False
+    if text.startswith("{") and any(key in text[:200] for key in _NOTICE_KEYS):
+        return False
+    return True
+
+
+def _lookup(conn, key: str, ttl: float):
+    row = conn.execute("SELECT value, created_at FROM results WHERE key = ?", (key,)).fetchone()
+    if row is not None and time.time() - row[1] < ttl:
+        return row[0]
+    return None
+
+
+def _claim(conn, key: str, lease: float) -> bool:
+    """Take the cross-process in-flight slot for key, replacing an expired claim."""
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT started_at FROM inflight WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[0] < lease:
+            conn.execute("COMMIT")
+            return False
+        conn.execute(
+            "INSERT OR REPLACE INTO inflight (key, owner, started_at) VALUES (?, ?, ?)",
+            (key, f"{os.getpid()}:{threading.get_ident()}", now),
+        )
+        conn.execute("COMMIT")
+        return True
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _release(conn, key: str) -> None:
+    conn.execute("DELETE FROM inflight WHERE key = ?", (key,))
+
+
+def cached_result(
+    method: Annotated[str, "routed method name, e.g. get_news"],
+    vendor: Annotated[str, "configured vendor(s) for the method"],
+    args: tuple,
+    kwargs: dict,
+    compute: Annotated[Callable[[], object], "performs the routed call"],
+):
+    """
+    Serve a routed call from the shared result cache, computing it at most once.
+
+    Results are stored in SQLite under data_cache_dir, so every worker process
+    sharing that directory reuses them until config["result_cache_ttl"] (or a
+    per-method entry in config["result_cache_ttls"]) expires. Concurrent callers
+    with the same key, in this process or in others, wait for the first caller
+    and share its result instead of repeating the call. If that caller fails or
+    its lease (config["vendor_call_timeout"]) runs out, one waiter takes over.
+    Only string results are cached, and error, notice or empty results are never
+    stored.
+    """
+    ttl = _ttl(method)
+    if not ttl:
+        return compute()
+
+    key = result_key(method, vendor, args, kwargs)
+    lease = get_config().get("vendor_call_timeout") or 120
+    conn = _connection()
+
+    while True:
+        value = _lookup(conn, key, ttl)
+        if value is not None:
+            emit("result_cache.hit", "debug", method=method, vendor=vendor)
+            return value
+
+        # One thread per process leads; the others wait on it
+        with _lock:
+            event = _inflight.get(key)
+            leader = event is None
+            if leader:
+                event = _inflight[key] = threading.Event()
+        if not leader:
+            if not event.wait(lease):
+                # The leading call is stuck past its lease; stop waiting on it
+                with _lock:
+                    if _inflight.get(key) is event:
+                        del _inflight[key]
+                emit("result_cache.takeover", "warning", method=method, vendor=vendor)
+            continue
+
+        try:
+            # One process per key computes; the others poll for its result
+            while not _claim(conn, key, lease):
+                time.sleep(_POLL_INTERVAL)
+                value = _lookup(conn, key, ttl)
+                if value is not None:
+                    emit("result_cache.hit", "debug", method=method, vendor=vendor, shared=True)
+                    return value
+
+            try:
+                # Another process may have finished between our lookup and the claim
+                value = _lookup(conn, key, ttl)
+                if value is not None:
+                    return value
+                value = compute()
+                if not _cacheable(value):
+                    emit("result_cache.skip", "debug", method=method, vendor=vendor)
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO results (key, method, vendor, value, created_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, method, vendor, value, time.time()),
+                    )
+                return value
+            finally:
+                _release(conn, key)
+        finally:
+            with _lock:
+                if _inflight.get(key) is event:
+                    del _inflight[key]
+            event.set()
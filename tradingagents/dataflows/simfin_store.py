@@ -0,0 +1,173 @@
+import os
+import json
+import shutil
+import tempfile
+from typing import Annotated, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .hot_cache import get_hot_cache, file_version
+
+# SimFin bulk file for each statement type, relative to the statement directory
+STATEMENT_FILES = {
+    "balance_sheet": "us-balance-{freq}.csv",
+    "cash_flow": "us-cashflow-{freq}.csv",
+    "income_statements": "us-income-{freq}.csv",
+}
+
+
+def _source_path(data_dir: str, statement: str, freq: str) -> str:
+    return os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        statement,
+        "companies",
+        "us",
+        STATEMENT_FILES[statement].format(freq=freq),
+    )
+
+
+def _statement_dir(statement: str) -> str:
+    config = get_config()
+    return os.path.join(config["data_cache_dir"], "simfin_store", statement)
+
+
+def _partition_file(partition_dir: str, ticker: str) -> str:
+    return os.path.join(partition_dir, f"{ticker.replace(os.sep, '_')}.pkl")
+
+
+def _manifest_path(statement: str, freq: str) -> str:
+    return os.path.join(_statement_dir(statement), f"{freq}.json")
+
+
+def _read_manifest(statement: str, freq: str) -> dict:
+    try:
+        with open(_manifest_path(statement, freq), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def ingest_simfin_statement(
+    data_dir: Annotated[str, "root data directory holding fundamental_data/simfin_data_all"],
+    statement: Annotated[str, "balance_sheet, cash_flow or income_statements"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"],
+) -> str:
+    """
+    Split a US-wide SimFin statement file into one pickle per ticker, each sorted by
+    publish date. The partition is rebuilt only when the source file changes.
+    Returns the partition directory.
+
+    Each build goes to its own versioned directory, and the manifest that points
+    readers at it is replaced atomically, so readers never see a missing or
+    half-written partition and concurrent ingests cannot clobber each other. The
+    previous version is kept for readers that resolved it just before the swap.
+    """
+    source = _source_path(data_dir, statement, freq)
+    source_version = file_version(source)
+    if source_version is None:
+        raise FileNotFoundError(source)
+
+    statement_dir = _statement_dir(statement)
+    manifest = _read_manifest(statement, freq)
+    if manifest.get("source_version") == list(source_version):
+        return os.path.join(statement_dir, manifest["partition"])
+
+    df = pd.read_csv(source, sep=";")
+
+    # Convert date strings to datetime objects and remove any time components
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+    df = df.sort_values("Publish Date", kind="stable")
+
+    # Build the new version in a staging directory, then move it under its final name
+    os.makedirs(statement_dir, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(dir=statement_dir, prefix=f".{freq}-")
+    for ticker, rows in df.groupby("Ticker", sort=False):
+        rows.to_pickle(_partition_file(staging_dir, str(ticker)))
+    name = f"{freq}-{int(source_version[0])}-{source_version[1]}"
+    try:
+        os.rename(staging_dir, os.path.join(statement_dir, name))
+    except OSError:
+        # A concurrent ingest already built this version
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    # Point readers at the new version
+    fd, tmp_path = tempfile.mkstemp(dir=statement_dir, prefix=f".{freq}-", suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        json.dump({"source": source, "source_version": list(source_version), "partition": name}, f)
+    os.replace(tmp_path, _manifest_path(statement, freq))
+
+    # Drop versions older than the one just replaced
+    keep = {name, manifest.get("partition")}
+    for entry in os.listdir(statement_dir):
+        if entry.startswith(f"{freq}-") and entry not in keep and not entry.endswith(".json"):
+            shutil.rmtree(os.path.join(statement_dir, entry), ignore_errors=True)
+    return os.path.join(statement_dir, name)
+
+
+def _load_partition(path: str):
+    rows = pd.read_pickle(path)
+    publish = rows["Publish Date"].to_numpy(dtype="datetime64[ns]")
+    return rows, publish
+
+
+def get_latest_statement(
+    data_dir: Annotated[str, "root data directory holding fundamental_data/simfin_data_all"],
+    statement: Annotated[str, "balance_sheet, cash_flow or income_statements"],
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+) -> Optional[pd.Series]:
+    """
+    Return the most recent statement row published on or before curr_date, or None.
+    The row is found by binary search over the ticker's publish-date index.
+    """
+    partition_dir = ingest_simfin_statement(data_dir, statement, freq)
+    path = _partition_file(partition_dir, ticker)
+    version = file_version(path)
+    if version is None:
+        return None
+
+    rows, publish = get_hot_cache().get_or_compute(
+        ("simfin", path, version), lambda: _load_partition(path)
+    )
+
+    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    idx = np.searchsorted(publish, np.datetime64(curr_date_dt.tz_localize(None)), "right") - 1
+    if idx < 0:
+        return None
+
+    # Among statements published on the same day, keep the first (as idxmax would)
+    idx = np.searchsorted(publish, publish[idx], "left")
+    return rows.iloc[idx]
+
+
+def get_publish_dates(
+    data_dir: Annotated[str, "root data directory holding fundamental_data/simfin_data_all"],
+    statement: Annotated[str, "balance_sheet, cash_flow or income_statements"],
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[str, "reporting frequency: annual / quarterly"],
+) -> pd.Series:
+    """
+    Publish date of each SimFin statement for ticker, indexed by report date
+    (both timezone-naive). Empty when SimFin has no statements for the ticker.
+    """
+    partition_dir = ingest_simfin_statement(data_dir, statement, freq)
+    path = _partition_file(partition_dir, ticker)
+    version = file_version(path)
+    if version is None:
+        return pd.Series(dtype="datetime64[ns]")
+
+    rows, _ = get_hot_cache().get_or_compute(
+        ("simfin", path, version), lambda: _load_partition(path)
+    )
+    dates = pd.Series(
+        rows["Publish Date"].dt.tz_localize(None).to_numpy(),
+        index=rows["Report Date"].dt.tz_localize(None).to_numpy(),
+    )
+    # Keep the first publication of each period, as filed
+    return dates[~dates.index.duplicated(keep="first")]
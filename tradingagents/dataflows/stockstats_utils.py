@@ -1,9 +1,20 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
+import threading
 from .config import get_config, DATA_DIR
+from .price_store import sync_price_history, get_price_version
+from .hot_cache import get_hot_cache, file_version
+from .trading_calendar import is_trading_day
+
+_key_locks = {}
+_key_locks_guard = threading.Lock()
+
+
+def _key_lock(key) -> threading.Lock:
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
 
 
 class StockstatsUtils:
@@ -17,62 +28,56 @@ class StockstatsUtils:
             str, "curr date for retrieving stock price data, YYYY-mm-dd"
         ],
     ):
+        # Weekends and exchange holidays have no bar; skip loading and computing
+        if not is_trading_day(curr_date):
+            return "N/A: Not a trading day (weekend or holiday)"
+
         # Get config and set up data directory path
         config = get_config()
         online = config["data_vendors"]["technical_indicators"] != "local"
+        cache = get_hot_cache()
 
         df = None
         data = None
 
         if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        DATA_DIR,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
             data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
+                DATA_DIR,
+                f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
             )
+            cache_key = ("stockstats", data_file, file_version(data_file))
+            df = cache.get(cache_key)
+            if df is None:
+                try:
+                    data = pd.read_csv(data_file)
+                    df = wrap(data)
+                except FileNotFoundError:
+                    raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        else:
+            curr_date = pd.to_datetime(curr_date)
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
+            # Online data served from the incremental local price store
+            data, _ = sync_price_history(symbol)
+            cache_key = ("stockstats", symbol.upper(), get_price_version(symbol))
+            df = cache.get(cache_key)
+            if df is None:
+                df = wrap(data.copy())
+                df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
             curr_date = curr_date.strftime("%Y-%m-%d")
 
-        df[indicator]  # trigger stockstats to calculate the indicator
+        if indicator not in df.columns:
+            # Cached frames are shared across vendor threads and never modified in
+            # place: the column is added to a copy that replaces the cached frame.
+            # The lock lets a concurrent call for another indicator build on it.
+            with _key_lock(cache_key):
+                cached = cache.get(cache_key)
+                if cached is not None:
+                    df = cached
+                if indicator not in df.columns:
+                    df = df.copy()
+                    df[indicator]  # trigger stockstats to calculate the indicator
+                    cache.put(cache_key, df)
+
         matching_rows = df[df["Date"].str.startswith(curr_date)]
 
         if not matching_rows.empty:
@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import threading
+from collections import deque
+from typing import Annotated, Optional
+
+from .config import get_config
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+
+
+def _level_no(level) -> int:
+    return level if isinstance(level, int) else LEVELS[str(level).lower()]
+
+
+class ConsoleSink:
+    """Human-readable one-line events on stdout."""
+
+    def __init__(self, level="info", stream=None):
+        self.level = _level_no(level)
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def handle(self, event: dict) -> None:
+        fields = " ".join(
+            f"{k}={v}" for k, v in event.items() if k not in ("ts", "level", "event", "thread")
+        )
+        with self._lock:
+            print(f"{event['level'].upper()}: {event['event']} {fields}", file=self.stream)
+
+
+class JsonlFileSink:
+    """Append events as JSON lines, for aggregation across runs."""
+
+    def __init__(self, path: str, level="debug"):
+        self.level = _level_no(level)
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def handle(self, event: dict) -> None:
+        line = json.dumps(event, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line)
+
+
+class RingBufferSink:
+    """Keep the most recent events in memory."""
+
+    def __init__(self, capacity: int = 1000, level="info"):
+        self.level = _level_no(level)
+        self.events = deque(maxlen=capacity)
+
+    def handle(self, event: dict) -> None:
+        self.events.append(event)
+
+    def recent(self, n: Optional[int] = None) -> list:
+        events = list(self.events)
+        return events if n is None else events[-n:]
+
+
+class MetricsSink:
+    """
+    Counters per (method, vendor, outcome) over vendor call events: call count,
+    total latency and total bytes returned. It subscribes to those events only
+    (see ``subscribed``), so other debug events still skip the sinks entirely.
+    """
+
+    def __init__(self, level="debug", event_name: str = "vendor.call"):
+        self.level = _level_no(level)
+        self.event_name = event_name
+        self.subscribed = {event_name}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def handle(self, event: dict) -> None:
+        if event["event"] != self.event_name:
+            return
+        key = (event.get("method"), event.get("vendor"), event.get("outcome"))
+        with self._lock:
+            counter = self._counters.setdefault(key, {"calls": 0, "latency": 0.0, "bytes": 0})
+            counter["calls"] += 1
+            counter["latency"] += event.get("latency", 0.0)
+            counter["bytes"] += event.get("bytes", 0)
+
+    def summary(self) -> dict:
+        """Counters keyed by "method:vendor:outcome", with mean latency."""
+        with self._lock:
+            items = [(key, dict(counter)) for key, counter in self._counters.items()]
+        out = {}
+        for (method, vendor, outcome), counter in items:
+            counter["mean_latency"] = counter["latency"] / counter["calls"]
+            out[f"{method}:{vendor}:{outcome}"] = counter
+        return out
+
+
+_sinks = None
+# Lowest level any sink accepts for every event, and per event for sinks that
+# only subscribe to some events (a ``subscribed`` set)
+_min_level = 0
+_event_levels = {}
+_NEVER = LEVELS["error"] + 1
+_sinks_lock = threading.Lock()
+
+
+def _default_sinks() -> list:
+    config = get_config()
+    sinks = [
+        ConsoleSink(config.get("telemetry_console_level", "info")),
+        RingBufferSink(config.get("telemetry_ring_size", 1000), config.get("telemetry_ring_level", "info")),
+        MetricsSink(),
+    ]
+    if config.get("telemetry_log_file"):
+        sinks.append(JsonlFileSink(config["telemetry_log_file"]))
+    return sinks
+
+
+def _refresh_min_level() -> None:
+    global _min_level, _event_levels
+    _min_level = min((s.level for s in _sinks if getattr(s, "subscribed", None) is None), default=_NEVER)
+    event_levels = {}
+    for sink in _sinks:
+        for name in getattr(sink, "subscribed", None) or ():
+            event_levels[name] = min(event_levels.get(name, _NEVER), sink.level)
+    _event_levels = event_levels
+
+
+def get_sinks() -> list:
+    """Active sinks; created from the telemetry_* config keys on first use."""
+    global _sinks
+    with _sinks_lock:
+        if _sinks is None:
+            _sinks = _default_sinks()
+            _refresh_min_level()
+        return list(_sinks)
+
+
+def add_sink(sink) -> None:
+    """
+    Register a sink: any object with a ``level`` and a ``handle(event)`` method,
+    and optionally a ``subscribed`` set naming the only events it receives.
+    """
+    global _sinks
+    get_sinks()
+    with _sinks_lock:
+        _sinks = _sinks + [sink]
+        _refresh_min_level()
+
+
+def remove_sink(sink) -> None:
+    global _sinks
+    get_sinks()
+    with _sinks_lock:
+        _sinks = [s for s in _sinks if s is not sink]
+        _refresh_min_level()
+
+
+def emit(
+    event: Annotated[str, "event name, e.g. vendor.call"],
+    level: Annotated[str, "debug, info, warning or error"] = "info",
+    **fields,
+) -> None:
+    """
+    Send a structured event to every sink at or below its level. Events below all
+    sink levels return before anything is built.
+    """
+    sinks = _sinks if _sinks is not None else get_sinks()
+    level_no = LEVELS[level]
+    if level_no < _min_level and level_no < _event_levels.get(event, _NEVER):
+        return
+    record = {
+        "ts": time.time(),
+        "level": level,
+        "event": event,
+        "thread": threading.current_thread().name,
+    }
+    record.update(fields)
+    for sink in sinks:
+        subscribed = getattr(sink, "subscribed", None)
+        if level_no >= sink.level and (subscribed is None or event in subscribed):
+            try:
+                sink.handle(record)
+            except Exception:
+                # Telemetry must never break a data call
+                pass
+
+
+def _find_sink(kind):
+    for sink in get_sinks():
+        if isinstance(sink, kind):
+            return sink
+    return None
+
+
+def recent_events(n: Optional[int] = None) -> list:
+    """Most recent events from the first ring buffer sink."""
+    sink = _find_sink(RingBufferSink)
+    return sink.recent(n) if sink else []
+
+
+def metrics_summary() -> dict:
+    """Vendor call counters from the first metrics sink."""
+    sink = _find_sink(MetricsSink)
+    return sink.summary() if sink else {}
+
+
+def payload_size(result) -> int:
+    """Size in bytes of a vendor result as returned to the agents."""
+    text = result if isinstance(result, str) else str(result)
+    return len(text.encode("utf-8", errors="replace"))
@@ -0,0 +1,111 @@
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Annotated, Union
+
+import numpy as np
+import pandas as pd
+
+DateLike = Union[str, date, pd.Timestamp]
+
+# Unscheduled NYSE closures (national days of mourning, weather, September 11)
+SPECIAL_CLOSURES = [
+    "1994-04-27",
+    "2001-09-11", "2001-09-12", "2001-09-13", "2001-09-14",
+    "2004-06-11",
+    "2007-01-02",
+    "2012-10-29", "2012-10-30",
+    "2018-12-05",
+    "2025-01-09",
+]
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """n-th given weekday (Mon=0) of a month; n=-1 for the last one."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    """Western Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+
+def _observed(day: date) -> date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday."""
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+@lru_cache(maxsize=None)
+def nyse_holidays(year: int) -> tuple:
+    """Regular NYSE full-day holidays for one year, per the current holiday rules."""
+    days = []
+    new_year = date(year, 1, 1)
+    # A Saturday New Year's Day is not observed on the preceding Friday
+    if new_year.weekday() != 5:
+        days.append(_observed(new_year))
+    if year >= 1998:
+        days.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    days.append(_nth_weekday(year, 2, 0, 3))  # Washington's Birthday
+    days.append(_easter(year) - timedelta(days=2))  # Good Friday
+    days.append(_nth_weekday(year, 5, 0, -1))  # Memorial Day
+    if year >= 2022:
+        days.append(_observed(date(year, 6, 19)))  # Juneteenth
+    days.append(_observed(date(year, 7, 4)))  # Independence Day
+    days.append(_nth_weekday(year, 9, 0, 1))  # Labor Day
+    days.append(_nth_weekday(year, 11, 3, 4))  # Thanksgiving
+    days.append(_observed(date(year, 12, 25)))  # Christmas
+    return tuple(days)
+
+
+@lru_cache(maxsize=64)
+def _calendar(first_year: int, last_year: int) -> np.busdaycalendar:
+    days = [d for year in range(first_year, last_year + 1) for d in nyse_holidays(year)]
+    days += [d for d in SPECIAL_CLOSURES if first_year <= int(d[:4]) <= last_year]
+    return np.busdaycalendar(holidays=np.array(days, dtype="datetime64[D]"))
+
+
+def _day(value: DateLike) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+def trading_days(
+    start: Annotated[DateLike, "first calendar day, inclusive"],
+    end: Annotated[DateLike, "last calendar day, inclusive"],
+) -> pd.DatetimeIndex:
+    """NYSE trading days in [start, end], oldest first."""
+    first, last = _day(start), _day(end)
+    if last < first:
+        return pd.DatetimeIndex([])
+    calendar = _calendar(pd.Timestamp(first).year, pd.Timestamp(last).year)
+    days = np.arange(first, last + 1, dtype="datetime64[D]")
+    return pd.DatetimeIndex(days[np.is_busday(days, busdaycal=calendar)])
+
+
+def is_trading_day(day: Annotated[DateLike, "calendar day"]) -> bool:
+    day = _day(day)
+    year = pd.Timestamp(day).year
+    return bool(np.is_busday(day, busdaycal=_calendar(year, year)))
+
+
+def previous_trading_day(day: Annotated[DateLike, "calendar day"]) -> pd.Timestamp:
+    """The latest trading day on or before day."""
+    day = _day(day)
+    year = pd.Timestamp(day).year
+    return pd.Timestamp(np.busday_offset(day, 0, roll="backward", busdaycal=_calendar(year - 1, year)))
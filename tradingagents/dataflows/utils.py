@@ -1,5 +1,6 @@
 import os
 import json
+import sqlite3
 import pandas as pd
 from datetime import date, timedelta, datetime
 from typing import Annotated
@@ -37,3 +38,40 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+def connect_sqlite(path: str, timeout: float = 30.0) -> sqlite3.Connection:
+    """
+    Open a SQLite database shared between processes. WAL mode lets readers run
+    alongside a writer; callers take write locks with BEGIN IMMEDIATE.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # tiktoken missing, or its encoding could not be loaded
+            _encoding = False
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """Prompt tokens for text: exact with tiktoken installed, else ~4 characters per token."""
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
@@ -0,0 +1,149 @@
+import time
+import threading
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from .config import get_config
+from .telemetry import emit
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Stats:
+    """Rolling outcomes of one (vendor, method) pair and its circuit breaker."""
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.errors = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class VendorHealth:
+    """
+    Per-(vendor, method) latency and error statistics with circuit breakers.
+
+    A breaker opens after ``failure_threshold`` consecutive failures, and calls to
+    that vendor are skipped. After ``cooldown`` seconds, a single probe call is let
+    through (half-open). It closes the breaker on success or re-opens it on failure.
+    """
+
+    def __init__(self, window: int = 50, failure_threshold: int = 3, cooldown: float = 60.0):
+        self.window = window
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, vendor: str, method: str) -> _Stats:
+        stats = self._stats.get((vendor, method))
+        if stats is None:
+            stats = self._stats[(vendor, method)] = _Stats(self.window)
+        return stats
+
+    def is_open(self, vendor: str, method: str) -> bool:
+        """Whether the breaker currently rejects calls (without claiming a probe)."""
+        with self._lock:
+            stats = self._get(vendor, method)
+            if stats.state == OPEN:
+                return time.monotonic() - stats.opened_at < self.cooldown
+            return stats.state == HALF_OPEN and stats.probing
+
+    def allow(self, vendor: str, method: str) -> bool:
+        """Whether a call may go to this vendor now; claims the probe slot when half-open."""
+        with self._lock:
+            stats = self._get(vendor, method)
+            if stats.state == CLOSED:
+                return True
+            if stats.state == OPEN and time.monotonic() - stats.opened_at >= self.cooldown:
+                stats.state = HALF_OPEN
+                stats.probing = False
+            if stats.state == HALF_OPEN and not stats.probing:
+                stats.probing = True
+                return True
+            return False
+
+    def record(self, vendor: str, method: str, latency: float, ok: bool) -> None:
+        with self._lock:
+            stats = self._get(vendor, method)
+            stats.latencies.append(latency)
+            stats.errors.append(not ok)
+            if ok:
+                stats.consecutive_failures = 0
+                stats.state = CLOSED
+                stats.probing = False
+                return
+            stats.consecutive_failures += 1
+            if stats.state == HALF_OPEN or stats.consecutive_failures >= self.failure_threshold:
+                if stats.state != OPEN:
+                    emit(
+                        "vendor.circuit_open", "warning", method=method, vendor=vendor,
+                        failures=stats.consecutive_failures,
+                    )
+                stats.state = OPEN
+                stats.opened_at = time.monotonic()
+                stats.probing = False
+
+    def latency_quantile(self, vendor: str, method: str, q: float, min_samples: int = 5) -> Optional[float]:
+        """Latency quantile in seconds over the rolling window, or None with too few samples."""
+        with self._lock:
+            latencies = list(self._get(vendor, method).latencies)
+        if len(latencies) < min_samples:
+            return None
+        return float(np.quantile(latencies, q))
+
+    def error_rate(self, vendor: str, method: str) -> float:
+        with self._lock:
+            errors = self._get(vendor, method).errors
+            return sum(errors) / len(errors) if errors else 0.0
+
+    def rank(self, vendors: list, method: str) -> list:
+        """Order vendors by rolling error rate, then median latency (stable; unseen vendors first)."""
+        def key(vendor):
+            median = self.latency_quantile(vendor, method, 0.5, min_samples=1)
+            return (round(self.error_rate(vendor, method), 1), median or 0.0)
+
+        return sorted(vendors, key=key)
+
+    def snapshot(self) -> dict:
+        """Current stats for every (vendor, method) seen, keyed by "vendor:method"."""
+        with self._lock:
+            items = [
+                (key, stats.state, list(stats.latencies), list(stats.errors))
+                for key, stats in self._stats.items()
+            ]
+        out = {}
+        for (vendor, method), state, latencies, errors in items:
+            latencies = np.array(latencies, dtype=float)
+            out[f"{vendor}:{method}"] = {
+                "state": state,
+                "calls": len(errors),
+                "error_rate": sum(errors) / len(errors) if errors else 0.0,
+                "p50": float(np.quantile(latencies, 0.5)) if len(latencies) else None,
+                "p95": float(np.quantile(latencies, 0.95)) if len(latencies) else None,
+            }
+        return out
+
+
+_vendor_health = None
+_vendor_health_lock = threading.Lock()
+
+
+def get_vendor_health() -> VendorHealth:
+    """Process-wide vendor health registry, configured from the vendor_* config keys."""
+    global _vendor_health
+    with _vendor_health_lock:
+        if _vendor_health is None:
+            config = get_config()
+            _vendor_health = VendorHealth(
+                window=config.get("vendor_health_window", 50),
+                failure_threshold=config.get("vendor_breaker_failures", 3),
+                cooldown=config.get("vendor_breaker_cooldown", 60),
+            )
+        return _vendor_health
@@ -3,7 +3,20 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import yfinance as yf
 import os
+import time
+import threading
+import pandas as pd
+from .config import get_config
+from .telemetry import emit
 from .stockstats_utils import StockstatsUtils
+from .price_store import get_price_history, sync_price_history, get_price_version
+from .hot_cache import get_hot_cache, file_version, estimate_nbytes
+from .indicator_engine import INDICATOR_DESCRIPTIONS, compute_indicators, indicator_window, indicator_table
+from .trading_calendar import trading_days
+from .indicator_store import get_indicator_history
+from .fundamentals_warehouse import get_statement_as_of, META_COLUMNS
+from .fundamentals_view import compact_enabled, compact_statement
+from .insider_activity import from_yfinance, insider_report
 
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -14,11 +27,8 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
-
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    # Read the requested range from the local price store (end date is exclusive)
+    data = get_price_history(symbol, start_date, end_date)
 
     # Check if data is empty
     if data.empty:
@@ -26,9 +36,8 @@ def get_YFin_data_online(
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
-    # Remove timezone info from index for cleaner output
-    if data.index.tz is not None:
-        data.index = data.index.tz_localize(None)
+    data = data.set_index("Date")
+    data["Volume"] = data["Volume"].astype("int64")
 
     # Round numerical values to 2 decimal places for cleaner display
     numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
@@ -55,229 +64,119 @@ def get_stock_stats_indicators_window(
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
+    best_ind_params = INDICATOR_DESCRIPTIONS
 
     # Support for comma-separated indicators (bulk request)
     if "," in indicator:
-        indicators_list = [i.strip() for i in indicator.split(",")]
-        result_str = ""
-        for ind in indicators_list:
-            if ind in best_ind_params:
-                # Recursively call for each indicator
-                # Optimization: We could optimize this further but for now recursion is safest
-                # to reuse the logic. Since _get_stock_stats_bulk caches data, it should be fast.
-                result_str += get_stock_stats_indicators_window(symbol, ind, curr_date, look_back_days)
-                result_str += "\n\n" + "="*50 + "\n\n"
-        return result_str
-
-    if indicator not in best_ind_params:
-        raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
-        )
+        requested = [i.strip() for i in indicator.split(",") if i.strip()]
+        indicators_list = [i for i in requested if i in best_ind_params]
+        unsupported = [i for i in requested if i not in best_ind_params]
+        if not indicators_list:
+            raise ValueError(
+                f"Indicators {unsupported} are not supported. Please choose from: {list(best_ind_params.keys())}"
+            )
+    else:
+        if indicator not in best_ind_params:
+            raise ValueError(
+                f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
+            )
+        indicators_list, unsupported = [indicator], []
+    note = f"# Unsupported indicators skipped: {', '.join(unsupported)}\n" if unsupported else ""
 
     end_date = curr_date
     curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date_dt - relativedelta(days=look_back_days)
 
-    # Optimized: Get stock data once and calculate indicators for all dates
+    # Optimized: compute the whole indicator catalog once, then slice each window by date
     try:
-        indicator_data = _get_stock_stats_bulk(symbol, indicator, curr_date)
-        
-        # Generate the date range we need
-        current_dt = curr_date_dt
-        date_values = []
-        
-        while current_dt >= before:
-            date_str = current_dt.strftime('%Y-%m-%d')
-            
-            # Look up the indicator value for this date
-            if date_str in indicator_data:
-                indicator_value = indicator_data[date_str]
-            else:
-                indicator_value = "N/A: Not a trading day (weekend or holiday)"
-            
-            date_values.append((date_str, indicator_value))
-            current_dt = current_dt - relativedelta(days=1)
-        
-        # Build the result string
-        ind_string = ""
-        for date_str, value in date_values:
-            ind_string += f"{date_str}: {value}\n"
-        
+        indicator_frame = _get_indicator_frame(symbol)
     except Exception as e:
-        print(f"Error getting bulk stockstats data: {e}")
-        # Fallback to original implementation if bulk method fails
-        ind_string = ""
-        curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-        while curr_date_dt >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date_dt.strftime("%Y-%m-%d")
+        emit("indicators.failed", "warning", symbol=symbol.upper(), error=str(e))
+        indicator_frame = None
+
+    if "," in indicator and indicator_frame is not None:
+        # One date x indicator table over trading days instead of a block per indicator
+        return note + indicator_table(
+            indicator_frame[indicators_list],
+            pd.Timestamp(before),
+            pd.Timestamp(curr_date_dt),
+            best_ind_params,
+            f"{symbol.upper()} indicators from {before.strftime('%Y-%m-%d')} to {end_date} (trading days, newest first)",
+        )
+
+    result_str = ""
+    for ind in indicators_list:
+        if indicator_frame is not None:
+            ind_string = indicator_window(
+                indicator_frame[ind], pd.Timestamp(before), pd.Timestamp(curr_date_dt)
             )
-            ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
-            curr_date_dt = curr_date_dt - relativedelta(days=1)
-
-    result_str = (
-        f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
-        + ind_string
-        + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
-    )
+        else:
+            # Fallback to the per-day stockstats lookup if the bulk path fails
+            ind_string = ""
+            for day_dt in trading_days(before, curr_date_dt)[::-1]:
+                indicator_value = get_stockstats_indicator(
+                    symbol, ind, day_dt.strftime("%Y-%m-%d")
+                )
+                ind_string += f"{day_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
 
-    return result_str
+        ind_result = (
+            f"## {ind} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
+            + ind_string
+            + "\n\n"
+            + best_ind_params.get(ind, "No description available.")
+        )
+
+        if "," in indicator:
+            result_str += ind_result + "\n\n" + "="*50 + "\n\n"
+        else:
+            result_str = ind_result
+
+    return note + result_str
 
 
-def _get_stock_stats_bulk(
+def _load_price_frame(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to calculate"],
-    curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+):
     """
-    Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    Load the daily OHLCV history used for indicator calculation.
+    Returns (frame, version) where version identifies the underlying data.
     """
-    from .config import get_config
-    import pandas as pd
-    from stockstats import wrap
-    import os
-    
     config = get_config()
     online = config["data_vendors"]["technical_indicators"] != "local"
-    
+
     if not online:
         # Local data path
-        try:
-            data = pd.read_csv(
-                os.path.join(
-                    config.get("data_cache_dir", "data"),
-                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                )
-            )
-            df = wrap(data)
-        except FileNotFoundError:
-            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-    else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
         data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
+            config.get("data_cache_dir", "data"),
+            f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
         )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
-        df = wrap(data)
-        df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    
-    # Calculate the indicator for all rows at once
-    df[indicator]  # This triggers stockstats to calculate the indicator
-    
-    # Create a dictionary mapping date strings to indicator values
-    result_dict = {}
-    for _, row in df.iterrows():
-        date_str = row["Date"]
-        indicator_value = row[indicator]
-        
-        # Handle NaN/None values
-        if pd.isna(indicator_value):
-            result_dict[date_str] = "N/A"
-        else:
-            result_dict[date_str] = str(indicator_value)
-    
-    return result_dict
+        version = file_version(data_file)
+        if version is None:
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        frame = get_hot_cache().get_or_compute(
+            ("price_csv", data_file, version), lambda: pd.read_csv(data_file)
+        )
+        return frame, (data_file, version)
+
+    # Online data served from the incremental local price store
+    frame, _ = sync_price_history(symbol)
+    return frame, (symbol.upper(), get_price_version(symbol))
+
+
+def _get_indicator_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> pd.DataFrame:
+    """
+    Get every supported indicator for a symbol; returns a date-indexed frame.
+    Results are kept in the hot cache until the price data version changes.
+    """
+    frame, version = _load_price_frame(symbol)
+    if get_config()["data_vendors"]["technical_indicators"] != "local":
+        # Persisted series, extended incrementally as the price store grows
+        compute = lambda: get_indicator_history(symbol)
+    else:
+        compute = lambda: compute_indicators(frame)
+    return get_hot_cache().get_or_compute(("indicators",) + version, compute)
 
 
 def get_stockstats_indicator(
@@ -306,31 +205,124 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+# yf.Ticker attribute holding each statement, by (statement, frequency)
+STATEMENT_ATTRIBUTES = {
+    ("balance_sheet", "quarterly"): "quarterly_balance_sheet",
+    ("balance_sheet", "annual"): "balance_sheet",
+    ("cashflow", "quarterly"): "quarterly_cashflow",
+    ("cashflow", "annual"): "cashflow",
+    ("income_stmt", "quarterly"): "quarterly_income_stmt",
+    ("income_stmt", "annual"): "income_stmt",
+}
+
+_bundle_locks = {}
+_bundle_locks_guard = threading.Lock()
+
+
+def _bundle_lock(symbol: str) -> threading.Lock:
+    with _bundle_locks_guard:
+        return _bundle_locks.setdefault(symbol, threading.Lock())
+
+
+def _get_statement_data(symbol: str, attribute: str):
+    """
+    Serve a yfinance statement (or insider_transactions) from the per-symbol bundle.
+
+    The first request for a symbol fetches all quarterly and annual statements on
+    one shared yf.Ticker; the bundle is kept in the hot cache for
+    config["yf_statement_ttl"] seconds. Statements that failed to fetch are retried
+    on demand rather than cached.
+    """
+    symbol = symbol.upper()
+    key = ("yf_statements", symbol)
+    cache = get_hot_cache()
+    ttl = get_config().get("yf_statement_ttl", 6 * 3600)
+
+    with _bundle_lock(symbol):
+        bundle = cache.get(key)
+        if bundle is None or time.time() - bundle["fetched_at"] >= ttl:
+            bundle = {"fetched_at": time.time(), "ticker": yf.Ticker(symbol), "data": {}}
+            for name in STATEMENT_ATTRIBUTES.values():
+                try:
+                    bundle["data"][name] = getattr(bundle["ticker"], name)
+                except Exception as e:
+                    emit("yfinance.prefetch_failed", "warning", symbol=symbol, attribute=name, error=str(e))
+            cache.put(key, bundle, estimate_nbytes(bundle["data"]))
+
+        if attribute not in bundle["data"]:
+            bundle["data"][attribute] = getattr(bundle["ticker"], attribute)
+            cache.put(key, bundle, estimate_nbytes(bundle["data"]))
+        return bundle["data"][attribute]
+
+
+# Warehouse statement name for each yfinance statement
+WAREHOUSE_STATEMENTS = {
+    "balance_sheet": "balance_sheet",
+    "cashflow": "cashflow",
+    "income_stmt": "income_statement",
+}
+
+
+def _statement_as_of(ticker: str, statement: str, freq: str, curr_date: str):
+    """
+    Statement periods published on or before curr_date from the fundamentals
+    warehouse, in yfinance layout (line items by period end, newest first).
+    Returns (data, warehouse rows), or (None, None) when nothing was published yet.
+    """
+    period = "quarterly" if freq.lower() == "quarterly" else "annual"
+    attribute = STATEMENT_ATTRIBUTES[(statement, period)]
+
+    def fetch():
+        frame = _get_statement_data(ticker, attribute).T
+        frame.index.name = "Report Date"
+        return frame.reset_index()
+
+    rows = get_statement_as_of(
+        "yfinance", ticker, WAREHOUSE_STATEMENTS[statement], period, curr_date, fetch
+    )
+    if rows is None:
+        return None, None
+
+    data = rows.drop(columns=META_COLUMNS[1:]).set_index("Report Date").T
+    data.columns = pd.DatetimeIndex(data.columns)
+    return data.dropna(how="all"), rows
+
+
+def _statement_text(title: str, ticker: str, statement: str, freq: str, curr_date: str, data, rows) -> str:
+    """Header plus the statement CSV, or its compact derived-metrics view (config["fundamentals_view"])."""
+    latest = rows.iloc[0]
+    header = f"# {title} data for {ticker.upper()} ({freq})\n"
+    if curr_date:
+        header += f"# Statements published on or before: {curr_date}\n"
+    header += (
+        f"# Latest period: {latest['Report Date']:%Y-%m-%d}, "
+        f"published {latest['Publish Date']:%Y-%m-%d} ({latest['Publish Basis']})\n"
+    )
+    header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+
+    # Convert to CSV string for consistency with other functions
+    full_text = header + data.to_csv()
+    if not compact_enabled():
+        return full_text
+    period = "quarterly" if freq.lower() == "quarterly" else "annual"
+    return header + compact_statement(
+        rows, "yfinance", WAREHOUSE_STATEMENTS[statement], period, raw_text=full_text
+    )
+
+
 def get_balance_sheet(
     ticker: Annotated[str, "ticker symbol of the company"],
     freq: Annotated[str, "frequency of data: 'annual' or 'quarterly'"] = "quarterly",
-    curr_date: Annotated[str, "current date (not used for yfinance)"] = None
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"] = None
 ):
-    """Get balance sheet data from yfinance."""
+    """Get balance sheet data from yfinance, as published on or before curr_date."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        
-        if freq.lower() == "quarterly":
-            data = ticker_obj.quarterly_balance_sheet
-        else:
-            data = ticker_obj.balance_sheet
+        data, rows = _statement_as_of(ticker, "balance_sheet", freq, curr_date)
             
-        if data.empty:
+        if data is None or data.empty:
             return f"No balance sheet data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
-        # Add header information
-        header = f"# Balance Sheet data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        return header + csv_string
+        return _statement_text("Balance Sheet", ticker, "balance_sheet", freq, curr_date, data, rows)
         
     except Exception as e:
         return f"Error retrieving balance sheet for {ticker}: {str(e)}"
@@ -339,28 +331,16 @@ def get_balance_sheet(
 def get_cashflow(
     ticker: Annotated[str, "ticker symbol of the company"],
     freq: Annotated[str, "frequency of data: 'annual' or 'quarterly'"] = "quarterly",
-    curr_date: Annotated[str, "current date (not used for yfinance)"] = None
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"] = None
 ):
-    """Get cash flow data from yfinance."""
+    """Get cash flow data from yfinance, as published on or before curr_date."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        
-        if freq.lower() == "quarterly":
-            data = ticker_obj.quarterly_cashflow
-        else:
-            data = ticker_obj.cashflow
+        data, rows = _statement_as_of(ticker, "cashflow", freq, curr_date)
             
-        if data.empty:
+        if data is None or data.empty:
             return f"No cash flow data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
-        # Add header information
-        header = f"# Cash Flow data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        return header + csv_string
+        return _statement_text("Cash Flow", ticker, "cashflow", freq, curr_date, data, rows)
         
     except Exception as e:
         return f"Error retrieving cash flow for {ticker}: {str(e)}"
@@ -369,52 +349,33 @@ def get_cashflow(
 def get_income_statement(
     ticker: Annotated[str, "ticker symbol of the company"],
     freq: Annotated[str, "frequency of data: 'annual' or 'quarterly'"] = "quarterly",
-    curr_date: Annotated[str, "current date (not used for yfinance)"] = None
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"] = None
 ):
-    """Get income statement data from yfinance."""
+    """Get income statement data from yfinance, as published on or before curr_date."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        
-        if freq.lower() == "quarterly":
-            data = ticker_obj.quarterly_income_stmt
-        else:
-            data = ticker_obj.income_stmt
+        data, rows = _statement_as_of(ticker, "income_stmt", freq, curr_date)
             
-        if data.empty:
+        if data is None or data.empty:
             return f"No income statement data found for symbol '{ticker}'"
             
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
-        # Add header information
-        header = f"# Income Statement data for {ticker.upper()} ({freq})\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        return header + csv_string
+        return _statement_text("Income Statement", ticker, "income_stmt", freq, curr_date, data, rows)
         
     except Exception as e:
         return f"Error retrieving income statement for {ticker}: {str(e)}"
 
 
 def get_insider_transactions(
-    ticker: Annotated[str, "ticker symbol of the company"]
+    ticker: Annotated[str, "ticker symbol of the company"],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"] = None
 ):
-    """Get insider transactions data from yfinance."""
+    """Get insider activity features aggregated from yfinance insider transactions."""
     try:
-        ticker_obj = yf.Ticker(ticker.upper())
-        data = ticker_obj.insider_transactions
-        
+        data = _get_statement_data(ticker, "insider_transactions")
+
         if data is None or data.empty:
             return f"No insider transactions data found for symbol '{ticker}'"
-            
-        # Convert to CSV string for consistency with other functions
-        csv_string = data.to_csv()
-        
-        # Add header information
-        header = f"# Insider Transactions data for {ticker.upper()}\n"
-        header += f"# Data retrieved on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        return header + csv_string
-        
+
+        return insider_report(ticker, from_yfinance(data), curr_date, "yfinance")
+
     except Exception as e:
         return f"Error retrieving insider transactions for {ticker}: {str(e)}"
\ No newline at end of file
@@ -18,6 +18,86 @@ DEFAULT_CONFIG = {
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # In-process cache for parsed price frames and computed indicators
+    "hot_cache_max_bytes": 256 * 1024 * 1024,
+    # Convert local finnhub JSON files to a memory-mappable form on first use
+    "finnhub_compact_format": False,
+    # Symbols per multi-ticker download when prefetching a universe of price stores
+    "price_prefetch_chunk_size": 100,
+    # Seconds a symbol's prefetched yfinance statements stay in memory
+    "yf_statement_ttl": 6 * 3600,
+    # Alpha Vantage quota shared by all processes using this data cache
+    "alpha_vantage_calls_per_minute": 5,
+    "alpha_vantage_calls_per_day": 25,
+    # Longest wait (seconds) for quota before falling back to another vendor
+    "alpha_vantage_max_wait": 60,
+    # Persistent Alpha Vantage response cache; per-function TTL overrides as
+    # {"FUNCTION": (ttl_seconds, stale_seconds)}
+    "alpha_vantage_cache": True,
+    "alpha_vantage_cache_ttls": {},
+    # "local": compute Alpha Vantage-routed indicators from the daily series
+    # (one request per symbol); "remote": one indicator endpoint call each
+    "alpha_vantage_indicator_mode": "local",
+    # Concurrent vendor calls (multi-implementation and comma-separated vendors):
+    # worker pool size and per-call timeout in seconds
+    "vendor_max_workers": 8,
+    "vendor_call_timeout": 120,
+    # Per-(vendor, method) circuit breakers: open after this many consecutive
+    # failures, probe again after the cooldown (seconds); stats over the last N calls
+    "vendor_breaker_failures": 3,
+    "vendor_breaker_cooldown": 60,
+    "vendor_health_window": 50,
+    # Also call the next vendor when the first runs past its p95 latency
+    "vendor_hedging": False,
+    # Structured telemetry for vendor routing: console level (debug, info,
+    # warning, error), optional JSONL event log (all levels) and in-memory ring
+    # buffer size and level
+    "telemetry_console_level": os.getenv("TRADINGAGENTS_TELEMETRY_LEVEL", "info"),
+    "telemetry_log_file": os.getenv("TRADINGAGENTS_TELEMETRY_LOG"),
+    "telemetry_ring_size": 1000,
+    "telemetry_ring_level": "info",
+    # Routed results shared across processes via data_cache_dir: a default TTL in
+    # seconds (0 disables) and per-method opt-ins, e.g. {"get_global_news": 6 * 3600}
+    "result_cache_ttl": 0,
+    "result_cache_ttls": {},
+    # Vendor call cassettes: "off", "record", "replay" (live call and record on a
+    # miss) or "strict" (fail on a miss); replayed calls sleep for their recorded
+    # latency times replay_latency_scale. cassette_dir defaults to data_cache_dir/cassettes
+    "vendor_replay_mode": os.getenv("TRADINGAGENTS_REPLAY_MODE", "off"),
+    "cassette_dir": None,
+    "replay_latency_scale": 0.0,
+    # Google News scraping politeness: concurrent requests, minimum spacing
+    # between request starts and extra random jitter (seconds); runs of uncached
+    # days longer than google_news_daily_span are scraped with one range query
+    "google_news_max_concurrency": 2,
+    "google_news_min_interval": 2.0,
+    "google_news_jitter": 2.0,
+    "google_news_daily_span": 3,
+    # Point-in-time fundamentals warehouse: publish lag assumed when a vendor gives
+    # no publish date, and how often an overdue filing is re-fetched (seconds)
+    "fundamentals_publish_lag_days": {"quarterly": 45, "annual": 90},
+    "fundamentals_refresh_retry": 24 * 3600,
+    # Statement tools return "compact" derived metrics (growth, margins, leverage,
+    # cash conversion) over the newest fundamentals_view_periods periods, or "raw"
+    # vendor statements. fundamentals_line_items overrides the line items shown per
+    # statement, e.g. {"income_statement": ["revenue", "net_income", "Research And Development"]}
+    "fundamentals_view": "compact",
+    "fundamentals_view_periods": 8,
+    "fundamentals_line_items": {},
+    # Insider activity features: trailing windows (days), number of largest trades
+    # listed, and distinct open-market buyers in a window that flag a cluster buy
+    "insider_windows": [30, 90, 180],
+    "insider_top_trades": 5,
+    "insider_cluster_min_buyers": 3,
+    # Opt-in token budget for agent tool outputs: a default for every tool (None
+    # disables) and per-tool budgets, e.g. {"get_stock_data": 2000}. Over-budget
+    # tables are rounded, resampled weekly/monthly, projected to close/volume, then
+    # summarized; other text is cut per "##" section
+    "tool_token_budget": None,
+    "tool_token_budgets": {},
+    # Connect/read timeout in seconds for direct HTTP requests to data vendors, so a
+    # stalled request fails instead of holding a vendor worker indefinitely
+    "http_timeout": 30,
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {